@@ -0,0 +1,474 @@
+# Wago poll and command path benchmarks
+"""Benchmarks of the poll and command paths against a fake ModbusHub.
+
+Runs with Home Assistant installed (the integration's runtime environment):
+
+    python benchmarks/bench_wago.py                     # compare with baseline.json
+    python benchmarks/bench_wago.py --update-baseline   # record a new baseline
+    python benchmarks/bench_wago.py --sizes 1 10 --latency 0.02
+
+Every scenario runs over two transports: "hub", the fake ModbusHub, and
+"pool", a connection pool of pipelined sessions to the simulator's Modbus TCP
+server. It reports frames, wall-clock time, command latency percentiles and
+the peak of memory allocated by each scenario. The suite is repeated --runs
+times. The run fails when the best of a metric regresses past the stored
+baseline, or when there is no baseline: frames may not grow at all,
+allocations and the frames of cover moves, which depend on the travel
+time, may grow by --tolerance. Times depend on the machine: they are scaled
+by a calibration workload run in the same process and only reported when
+they grow by more than --tolerance.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import gc
+import json
+import logging
+import math
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "tools")]
+
+from pymodbus.client import AsyncModbusTcpClient  # noqa: E402
+
+from homeassistant.components.modbus.const import (  # noqa: E402
+    CALL_TYPE_COIL,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_WRITE_COIL,
+    CALL_TYPE_WRITE_COILS,
+    CALL_TYPE_WRITE_REGISTER,
+    CALL_TYPE_WRITE_REGISTERS,
+    MODBUS_DOMAIN,
+)
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.wago import CONFIG_SCHEMA  # noqa: E402
+from custom_components.wago import motion  # noqa: E402
+from custom_components.wago.const import WAGO_DOMAIN  # noqa: E402
+from custom_components.wago.cover import WagoCover  # noqa: E402
+from custom_components.wago.light import WagoLight  # noqa: E402
+from custom_components.wago.wago import WagoHub  # noqa: E402
+from wago_simulator import Faults, WagoSimulator  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+HUB = "bench"
+TRANSPORTS = ("hub", "pool")
+
+# metrics that vary with the machine, checked relative to the calibration
+TIMINGS = ("wall_ms", "p50_ms", "p99_ms")
+# scenarios whose frames count motion reads during real travel time
+TIMED_FRAMES = ("cover_move",)
+CALIBRATION = "calibration"
+
+# cover travel and motion tick are shortened so the move scenario stays short
+TRAVEL_TIME = 0.5
+MOTION_INTERVAL = 0.05
+
+
+@dataclass
+class Response:
+    bits: list[bool] | None = None
+    registers: list[int] | None = None
+
+    def isError(self) -> bool:  # noqa: N802
+        return False
+
+
+class FakeClient:
+    connected = True
+
+
+class FakeModbusHub:
+    """ModbusHub stand-in answering from the simulator's process image.
+
+    Calls are serialized like ModbusHub.async_pb_call and each one takes
+    latency seconds. With a tcp client the hub sets up its connection pool
+    to the client's host and port and bypasses the fake.
+    """
+
+    def __init__(
+        self,
+        simulator: WagoSimulator,
+        latency: float,
+        client: AsyncModbusTcpClient | None = None,
+    ) -> None:
+        self.name = HUB
+        self._client = client or FakeClient()
+        self._simulator = simulator
+        self._latency = latency
+        self._lock = asyncio.Lock()
+        self.frames: Counter[str] = Counter()
+
+    async def async_pb_call(
+        self, unit: int | None, address: int, value: Any, use_call: str
+    ) -> Response:
+        async with self._lock:
+            if self._latency:
+                await asyncio.sleep(self._latency)
+            self.frames[use_call] += 1
+
+            image = self._simulator.image
+            if use_call == CALL_TYPE_COIL:
+                return Response(bits=[image.get_coil(address + i) for i in range(value)])
+            if use_call == CALL_TYPE_REGISTER_HOLDING:
+                return Response(registers=[image.registers.get(address + i, 0) for i in range(value)])
+            if use_call == CALL_TYPE_WRITE_COIL:
+                image.set_coil(address, bool(value))
+            elif use_call == CALL_TYPE_WRITE_COILS:
+                for i, bit in enumerate(value):
+                    image.set_coil(address + i, bool(bit))
+            elif use_call == CALL_TYPE_WRITE_REGISTER:
+                image.registers[address] = value
+            elif use_call == CALL_TYPE_WRITE_REGISTERS:
+                for i, register in enumerate(value):
+                    image.registers[address + i] = register
+            self._simulator.step(0)
+            return Response()
+
+    async def async_close(self) -> None:
+        if isinstance(self._client, AsyncModbusTcpClient):
+            self._client.close()
+
+
+# address layout, in registers of the WAGO flag area (coil 0x3000 + 16 * w + b
+# is bit b of register w): lights use one register each for set/rst/ison and
+# one for valset (low byte) and brightness (high byte), covers a PA/POSANG
+# register pair each and one set coil
+LIGHT_WORDS = 0x3000
+VALSET_WORDS = 0x3400
+COVER_SET_WORDS = 0x3800
+COVER_REGISTERS = 0x3C00
+
+
+def coil(word: int, bit: int = 0) -> int:
+    return 0x3000 + 16 * (word - 0x3000) + bit
+
+
+def light_config(index: int) -> dict[str, Any]:
+    return {
+        "name": f"Light {index}",
+        "unique_id": f"bench_light_{index}",
+        "address_set": coil(LIGHT_WORDS + index, 0),
+        "address_rst": coil(LIGHT_WORDS + index, 1),
+        "address_ison": coil(LIGHT_WORDS + index, 2),
+        "address_valset": coil(VALSET_WORDS + index, 0),
+        "address_brightness": coil(VALSET_WORDS + index, 8),
+        "scan_interval": 5,
+        # measure the command path, not the slider debounce window
+        "command_debounce": 0,
+    }
+
+
+def cover_config(index: int) -> dict[str, Any]:
+    return {
+        "name": f"Cover {index}",
+        "unique_id": f"bench_cover_{index}",
+        "address_set": coil(COVER_SET_WORDS) + index,
+        "address_reg_pa": COVER_REGISTERS + 2 * index,
+        "address_reg_posang": COVER_REGISTERS + 2 * index + 1,
+        "scan_interval": 5,
+        "command_debounce": 0,
+    }
+
+
+class Bench:
+    """Hub, entities and simulator for one scenario size and transport."""
+
+    def __init__(
+        self, size: int, transport: str, args: argparse.Namespace
+    ) -> None:
+        self.size = size
+        self.transport = transport
+        self.args = args
+        self.lights_config = [light_config(i) for i in range(size)]
+        self.covers_config = [cover_config(i) for i in range(size)]
+        self.simulator = WagoSimulator.from_config(
+            {WAGO_DOMAIN: [{"lights": self.lights_config, "covers": self.covers_config}]},
+            travel_time=TRAVEL_TIME,
+            faults=Faults(args.latency),
+            tick=0.01,
+        )
+        self.publishes = 0
+
+    async def async_setup(self, hass: HomeAssistant) -> None:
+        hub_config: dict[str, Any] = {
+            "name": HUB,
+            "hub": HUB,
+            "lights": self.lights_config,
+            "covers": self.covers_config,
+        }
+        client = None
+        if self.transport == "pool":
+            port = await self.simulator.async_start(port=0)
+            client = AsyncModbusTcpClient("127.0.0.1", port=port)
+            await client.connect()
+            hub_config["pool_size"] = self.args.pool_size
+            hub_config["max_in_flight"] = self.args.max_in_flight
+        config = CONFIG_SCHEMA({WAGO_DOMAIN: [hub_config]})[WAGO_DOMAIN][0]
+
+        self.modbus = FakeModbusHub(self.simulator, self.args.latency, client)
+        hass.data.setdefault(MODBUS_DOMAIN, {})[HUB] = self.modbus
+
+        self.hub = WagoHub(hass, config)
+        if not await self.hub.async_setup():
+            raise RuntimeError(f"Hub setup failed over {self.transport}")
+        if self.transport == "pool" and self.hub.pool is None:
+            raise RuntimeError("Connection pool was not set up")
+
+        self.lights = [
+            self._add(hass, WagoLight(hass, self.hub, entry), "light", i)
+            for i, entry in enumerate(config["lights"])
+        ]
+        self.covers = [
+            self._add(hass, WagoCover(hass, self.hub, entry), "cover", i)
+            for i, entry in enumerate(config["covers"])
+        ]
+        # only the scenarios poll, background ticks would blur the frame counts
+        self.hub.coordinator.async_stop()
+
+    @property
+    def frames(self) -> int:
+        if self.transport == "pool":
+            return self.simulator.stats.total
+        return sum(self.modbus.frames.values())
+
+    def _add(self, hass: HomeAssistant, entity: Any, domain: str, index: int) -> Any:
+        entity.hass = hass
+        entity.entity_id = f"{domain}.bench_{index}"
+
+        def publish() -> None:
+            self.publishes += 1
+
+        entity.async_write_ha_state = publish
+        entity.async_run()
+        return entity
+
+    async def async_step(self) -> None:
+        """Run the PLC program while a scenario is in flight."""
+        if self.transport == "pool":
+            # the simulator's server runs the program itself
+            return
+        while True:
+            await asyncio.sleep(0.01)
+            self.simulator.step(0.01)
+
+    async def async_close(self) -> None:
+        for entity in self.lights + self.covers:
+            entity.async_hold(update=False)
+        await self.hub.async_close()
+        await self.simulator.async_stop()
+
+
+async def measure(
+    bench: Bench, run: Callable[[], Awaitable[list[float] | None]]
+) -> dict[str, float]:
+    stepper = asyncio.create_task(bench.async_step())
+    frames = bench.frames
+    # count what the scenario allocates, not what earlier runs left behind
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        latencies = await run()
+    finally:
+        stepper.cancel()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    result = {
+        "frames": bench.frames - frames,
+        "wall_ms": round(elapsed * 1000, 2),
+        "alloc_kib": round((peak - traced) / 1024, 1),
+    }
+    if latencies:
+        latencies = sorted(latencies)
+        result["p50_ms"] = round(statistics.median(latencies) * 1000, 2)
+        result["p99_ms"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 2)
+    return result
+
+
+async def timed(call: Awaitable[Any]) -> float:
+    start = time.perf_counter()
+    await call
+    return time.perf_counter() - start
+
+
+async def run_size(
+    size: int, transport: str, args: argparse.Namespace
+) -> dict[str, dict[str, float]]:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        bench = Bench(size, transport, args)
+        await bench.async_setup(hass)
+        commands = min(size, args.commands)
+        results: dict[str, dict[str, float]] = {}
+
+        async def poll_cycle() -> None:
+            await bench.hub.coordinator.async_refresh()
+
+        async def light_updates() -> None:
+            await asyncio.gather(*(light.async_update() for light in bench.lights))
+
+        async def cover_updates() -> None:
+            await asyncio.gather(*(cover.async_update() for cover in bench.covers))
+
+        async def light_commands() -> list[float]:
+            return await asyncio.gather(
+                *(timed(light.async_turn_on(brightness=128)) for light in bench.lights[:commands])
+            )
+
+        async def cover_moves() -> list[float]:
+            return await asyncio.gather(
+                *(timed(cover._set_position_and_wait(100, 100)) for cover in bench.covers[:commands])
+            )
+
+        async def hub_helpers() -> None:
+            for light in bench.lights[:commands]:
+                await bench.hub.async_read_bool(light._address_ison)
+                await bench.hub.async_read_u8(light._address_brightness)
+                await bench.hub.async_write_u8(light._address_valset, 64)
+            for cover in bench.covers[:commands]:
+                await bench.hub.async_read_register(cover._address_ist)
+
+        scenarios = {
+            "poll_cycle": poll_cycle,
+            "light_update": light_updates,
+            "cover_update": cover_updates,
+            "light_command": light_commands,
+            "cover_move": cover_moves,
+            "hub_helpers": hub_helpers,
+        }
+        try:
+            for name, run in scenarios.items():
+                results[name] = await measure(bench, run)
+                # let the read cache expire between scenarios
+                await asyncio.sleep(bench.hub.cache._ttl)
+        finally:
+            await bench.async_close()
+            await hass.async_stop(force=True)
+
+        return results
+
+
+async def calibrate() -> dict[str, float]:
+    """Time a fixed event loop workload, the speed of this machine."""
+    best = math.inf
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(200):
+            await asyncio.gather(*(asyncio.sleep(0) for _ in range(100)))
+        best = min(best, time.perf_counter() - start)
+    return {"wall_ms": round(best * 1000, 2)}
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> tuple[list[str], list[str]]:
+    """Return the regressions and the advisory slowdowns against a baseline."""
+    regressions = []
+    slowdowns = []
+    scale = 1.0
+    if CALIBRATION in results and CALIBRATION in baseline:
+        # most of a scenario is simulated latency, which a faster machine
+        # does not shorten: a slower one widens the limits, none narrows them
+        scale = max(1.0, results[CALIBRATION]["wall_ms"] / baseline[CALIBRATION]["wall_ms"])
+    for key, metrics in results.items():
+        if key == CALIBRATION:
+            continue
+        for metric, value in metrics.items():
+            if (base := baseline.get(key, {}).get(metric)) is None:
+                continue
+            if metric in TIMINGS:
+                limit = base * scale * (1 + tolerance)
+                if value > limit:
+                    slowdowns.append(f"{key} {metric}: {value} > {base} (limit {limit:.2f})")
+                continue
+            exact = metric == "frames" and not key.startswith(TIMED_FRAMES)
+            limit = base if exact else base * (1 + tolerance)
+            if value > limit:
+                regressions.append(f"{key} {metric}: {value} > {base} (limit {limit:.2f})")
+    return regressions, slowdowns
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    motion.MOTION_INTERVAL = MOTION_INTERVAL
+    tracemalloc.start()
+
+    runs: list[dict[str, dict[str, float]]] = []
+    for _ in range(args.runs):
+        run: dict[str, dict[str, float]] = {CALIBRATION: await calibrate()}
+        for transport in args.transports:
+            for size in args.sizes:
+                for scenario, metrics in (await run_size(size, transport, args)).items():
+                    key = f"{scenario}[{size},{transport}]"
+                    run[key] = metrics
+                    print(f"{key:28} " + "  ".join(f"{m}={v}" for m, v in metrics.items()))
+        runs.append(run)
+
+    # the baseline holds the worst of the runs and is checked against the
+    # best, so noise within the runs does not fail the check; the machine
+    # speed is the best calibration in both
+    aggregate = max if args.update_baseline else min
+    results = {
+        key: {
+            metric: (min if key == CALIBRATION else aggregate)(run[key][metric] for run in runs)
+            for metric in metrics
+        }
+        for key, metrics in runs[0].items()
+    }
+
+    if args.update_baseline:
+        BASELINE.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {BASELINE}")
+        return 0
+
+    if not BASELINE.exists():
+        print(f"No baseline at {BASELINE}, record one with --update-baseline")
+        return 1
+
+    baseline = json.loads(BASELINE.read_text())
+    regressions, slowdowns = compare(results, baseline, args.tolerance)
+    for key in results.keys() - baseline.keys():
+        print(f"No baseline for {key}")
+    print(
+        f"Calibration {results[CALIBRATION]['wall_ms']} ms, "
+        f"baseline {baseline.get(CALIBRATION, {}).get('wall_ms')} ms"
+    )
+    for slowdown in slowdowns:
+        print(f"SLOWER {slowdown}")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds per Modbus call")
+    parser.add_argument("--commands", type=int, default=30, help="concurrent commands per scenario")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--pool-size", type=int, default=2, help="sessions of the pool transport")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="pipelined requests per session")
+    parser.add_argument("--runs", type=int, default=3, help="repetitions of the suite")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed growth of times and allocations")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(asyncio.run(async_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,20 +5,38 @@ import logging
 import voluptuous as vol
 from typing import cast
 
+from homeassistant.components.binary_sensor import (
+    DEVICE_CLASSES_SCHEMA as BINARY_SENSOR_DEVICE_CLASSES_SCHEMA,
+)
 from homeassistant.components.cover import (
     DEVICE_CLASSES_SCHEMA as COVER_DEVICE_CLASSES_SCHEMA,
 )
+from homeassistant.components.sensor import (
+    DEVICE_CLASSES_SCHEMA as SENSOR_DEVICE_CLASSES_SCHEMA,
+    STATE_CLASSES_SCHEMA as SENSOR_STATE_CLASSES_SCHEMA,
+)
 from homeassistant.components.switch import (
     DEVICE_CLASSES_SCHEMA as SWITCH_DEVICE_CLASSES_SCHEMA,
 )
 
-from homeassistant.components.modbus.const import MODBUS_DOMAIN
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+    MODBUS_DOMAIN,
+)
 from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_BINARY_SENSORS,
     CONF_LIGHTS,
     CONF_NAME,
     CONF_SCAN_INTERVAL,
     CONF_UNIQUE_ID,
     CONF_COVERS,
+    CONF_SENSORS,
+    CONF_SWITCHES,
+    CONF_UNIT_OF_MEASUREMENT,
     DEVICE_DEFAULT_NAME,
 )
 
@@ -40,14 +58,62 @@ from .const import (
     CONF_ERR_POS,
     CONF_ERR_ANG,
     CONF_TIMEOUT,
+    CONF_MAX_READ_GAP,
+    CONF_PULSE_WIDTH,
+    CONF_WRITE_WINDOW,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_IDLE_CYCLES,
+    CONF_CACHE_TTL,
+    CONF_QUEUE_DEPTH,
+    CONF_FAILURE_THRESHOLD,
+    CONF_MAX_BACKOFF,
+    CONF_MAX_IN_FLIGHT,
+    CONF_POOL_SIZE,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_PREDICTIVE,
+    CONF_OPTIMISTIC,
+    CONF_CONFIRM_WINDOW,
+    CONF_POSITION_DEADBAND,
+    CONF_PUBLISH_INTERVAL,
+    CONF_TRAVEL_TIME,
+    CONF_TILT_TIME,
+    CONF_INPUT_TYPE,
+    CONF_DATA_TYPE,
+    CONF_BYTE_ORDER,
+    CONF_WORD_ORDER,
+    CONF_SCALE,
+    CONF_OFFSET,
+    CONF_PRECISION,
+    CONF_STATE_CLASS,
+    DATA_TYPE_U16,
+    ORDER_BIG,
+    ORDER_LITTLE,
     DEFAULT_HUB,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_ERR_POS,
     DEFAULT_ERR_ANG,
     DEFAULT_COVER_CLASS,
     DEFAULT_TIMEOUT,
+    DEFAULT_MAX_READ_GAP,
+    DEFAULT_PULSE_WIDTH,
+    DEFAULT_WRITE_WINDOW,
+    DEFAULT_FAST_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_IDLE_CYCLES,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_QUEUE_DEPTH,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_MAX_BACKOFF,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_POOL_SIZE,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_CONFIRM_WINDOW,
+    DEFAULT_POSITION_DEADBAND,
+    DEFAULT_PUBLISH_INTERVAL,
 )
 
+from .codec import DATA_TYPES
 from .wago import WagoHub, async_wago_setup
 
 _LOGGER = logging.getLogger(__name__)
@@ -69,6 +135,25 @@ COVERS_SCHEMA = BASE_COMPONENT_SCHEMA.extend(
         vol.Required(CONF_ADDRESS_SET): cv.positive_int,
         vol.Required(CONF_ADDRESS_REG_PA): cv.positive_int,
         vol.Required(CONF_ADDRESS_REG_POSANG): cv.positive_int,
+        vol.Optional(
+            CONF_PULSE_WIDTH, default=DEFAULT_PULSE_WIDTH
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_COMMAND_DEBOUNCE, default=DEFAULT_COMMAND_DEBOUNCE
+        ): cv.time_period,
+        vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+        vol.Optional(
+            CONF_CONFIRM_WINDOW, default=DEFAULT_CONFIRM_WINDOW
+        ): cv.positive_time_period,
+        vol.Optional(CONF_PREDICTIVE, default=False): cv.boolean,
+        vol.Optional(CONF_TRAVEL_TIME): cv.positive_time_period,
+        vol.Optional(CONF_TILT_TIME): cv.positive_time_period,
+        vol.Optional(
+            CONF_POSITION_DEADBAND, default=DEFAULT_POSITION_DEADBAND
+        ): cv.positive_int,
+        vol.Optional(
+            CONF_PUBLISH_INTERVAL, default=DEFAULT_PUBLISH_INTERVAL
+        ): cv.time_period,
         vol.Optional(CONF_ERR_POS, default=DEFAULT_ERR_POS): cv.positive_int,
         vol.Optional(CONF_ERR_ANG, default=DEFAULT_ERR_ANG): cv.positive_int,
         vol.Optional(CONF_DEVICE_CLASS, default=DEFAULT_COVER_CLASS): COVER_DEVICE_CLASSES_SCHEMA,
@@ -80,11 +165,71 @@ LIGHTS_SCHEMA = BASE_COMPONENT_SCHEMA.extend(
         vol.Required(CONF_ADDRESS_SET): cv.positive_int,
         vol.Required(CONF_ADDRESS_RST): cv.positive_int,
         vol.Required(CONF_ADDRESS_ISON): cv.positive_int,
+        vol.Optional(
+            CONF_PULSE_WIDTH, default=DEFAULT_PULSE_WIDTH
+        ): cv.positive_time_period,
+        vol.Optional(
+            CONF_COMMAND_DEBOUNCE, default=DEFAULT_COMMAND_DEBOUNCE
+        ): cv.time_period,
+        vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+        vol.Optional(
+            CONF_CONFIRM_WINDOW, default=DEFAULT_CONFIRM_WINDOW
+        ): cv.positive_time_period,
         vol.Optional(CONF_ADDRESS_VALSET): cv.positive_int,
         vol.Optional(CONF_ADDRESS_BRIGHTNESS): cv.positive_int,
     }
 )
 
+BINARY_SENSORS_SCHEMA = BASE_COMPONENT_SCHEMA.extend(
+    {
+        vol.Required(CONF_ADDRESS): cv.positive_int,
+        vol.Optional(CONF_INPUT_TYPE, default=CALL_TYPE_COIL): vol.In(
+            [CALL_TYPE_COIL, CALL_TYPE_DISCRETE]
+        ),
+        vol.Optional(CONF_DEVICE_CLASS): BINARY_SENSOR_DEVICE_CLASSES_SCHEMA,
+    }
+)
+
+SENSORS_SCHEMA = BASE_COMPONENT_SCHEMA.extend(
+    {
+        vol.Required(CONF_ADDRESS): cv.positive_int,
+        vol.Optional(CONF_INPUT_TYPE, default=CALL_TYPE_REGISTER_HOLDING): vol.In(
+            [CALL_TYPE_REGISTER_HOLDING, CALL_TYPE_REGISTER_INPUT]
+        ),
+        vol.Optional(CONF_DATA_TYPE, default=DATA_TYPE_U16): vol.In(list(DATA_TYPES)),
+        vol.Optional(CONF_BYTE_ORDER, default=ORDER_BIG): vol.In([ORDER_BIG, ORDER_LITTLE]),
+        vol.Optional(CONF_WORD_ORDER, default=ORDER_BIG): vol.In([ORDER_BIG, ORDER_LITTLE]),
+        vol.Optional(CONF_SCALE, default=1): vol.Coerce(float),
+        vol.Optional(CONF_OFFSET, default=0): vol.Coerce(float),
+        vol.Optional(CONF_PRECISION): cv.positive_int,
+        vol.Optional(CONF_UNIT_OF_MEASUREMENT): cv.string,
+        vol.Optional(CONF_DEVICE_CLASS): SENSOR_DEVICE_CLASSES_SCHEMA,
+        vol.Optional(CONF_STATE_CLASS): SENSOR_STATE_CLASSES_SCHEMA,
+    }
+)
+
+SWITCHES_SCHEMA = vol.All(
+    BASE_COMPONENT_SCHEMA.extend(
+        {
+            vol.Exclusive(CONF_ADDRESS, "switch"): cv.positive_int,
+            vol.Exclusive(CONF_ADDRESS_SET, "switch"): cv.positive_int,
+            vol.Optional(CONF_ADDRESS_RST): cv.positive_int,
+            vol.Optional(CONF_ADDRESS_ISON): cv.positive_int,
+            vol.Optional(
+                CONF_PULSE_WIDTH, default=DEFAULT_PULSE_WIDTH
+            ): cv.positive_time_period,
+            vol.Optional(CONF_OPTIMISTIC, default=False): cv.boolean,
+            vol.Optional(
+                CONF_CONFIRM_WINDOW, default=DEFAULT_CONFIRM_WINDOW
+            ): cv.positive_time_period,
+            vol.Optional(CONF_DEVICE_CLASS): SWITCH_DEVICE_CLASSES_SCHEMA,
+        }
+    ),
+    cv.has_at_least_one_key(CONF_ADDRESS, CONF_ADDRESS_SET),
+    cv.key_dependency(CONF_ADDRESS_SET, CONF_ADDRESS_RST),
+    cv.key_dependency(CONF_ADDRESS_RST, CONF_ADDRESS_SET),
+)
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.All(
@@ -93,8 +238,46 @@ CONFIG_SCHEMA = vol.Schema(
                 {
                     vol.Optional(CONF_NAME, default=DEVICE_DEFAULT_NAME): cv.string,
                     vol.Optional(CONF_HUB, default=DEFAULT_HUB): cv.string,
+                    vol.Optional(
+                        CONF_MAX_READ_GAP, default=DEFAULT_MAX_READ_GAP
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_WRITE_WINDOW, default=DEFAULT_WRITE_WINDOW
+                    ): cv.positive_time_period,
+                    vol.Optional(
+                        CONF_FAST_SCAN_INTERVAL, default=DEFAULT_FAST_SCAN_INTERVAL
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_IDLE_CYCLES, default=DEFAULT_IDLE_CYCLES
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_CACHE_TTL, default=DEFAULT_CACHE_TTL
+                    ): cv.time_period,
+                    vol.Optional(
+                        CONF_QUEUE_DEPTH, default=DEFAULT_QUEUE_DEPTH
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_FAILURE_THRESHOLD, default=DEFAULT_FAILURE_THRESHOLD
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MAX_BACKOFF, default=DEFAULT_MAX_BACKOFF
+                    ): cv.positive_time_period,
+                    vol.Optional(
+                        CONF_MAX_IN_FLIGHT, default=DEFAULT_MAX_IN_FLIGHT
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_POOL_SIZE, default=DEFAULT_POOL_SIZE
+                    ): cv.positive_int,
                     vol.Optional(CONF_COVERS): vol.All(cv.ensure_list, [COVERS_SCHEMA]),
                     vol.Optional(CONF_LIGHTS): vol.All(cv.ensure_list, [LIGHTS_SCHEMA]),
+                    vol.Optional(CONF_BINARY_SENSORS): vol.All(
+                        cv.ensure_list, [BINARY_SENSORS_SCHEMA]
+                    ),
+                    vol.Optional(CONF_SENSORS): vol.All(cv.ensure_list, [SENSORS_SCHEMA]),
+                    vol.Optional(CONF_SWITCHES): vol.All(cv.ensure_list, [SWITCHES_SCHEMA]),
                 },
             ],
         )
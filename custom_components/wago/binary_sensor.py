@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.modbus.const import CALL_TYPE_DISCRETE
+from homeassistant.const import CONF_ADDRESS, CONF_BINARY_SENSORS, CONF_NAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+from . import get_hub
+from .const import CONF_INPUT_TYPE
+from .entity import BasePlatform
+from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Read configuration and create Modbus binary sensors."""
+    if discovery_info is None:
+        return
+
+    sensors = []
+    for entry in discovery_info[CONF_BINARY_SENSORS]:
+        hub: WagoHub = get_hub(hass, discovery_info[CONF_NAME])
+        sensors.append(WagoBinarySensor(hass, hub, entry))
+    async_add_entities(sensors)
+
+
+class WagoBinarySensor(BasePlatform, BinarySensorEntity):
+    def __init__(
+        self, hass: HomeAssistant, hub: WagoHub, config: dict[str, Any]
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(hass, hub, config)
+
+        self._address = int(config[CONF_ADDRESS])
+        self._input_type = config[CONF_INPUT_TYPE]
+
+        # polled with the shared block reads, scan_interval bounds the age
+        self._adaptive = False
+        if self._input_type == CALL_TYPE_DISCRETE:
+            self._discrete_inputs = [self._address]
+        else:
+            self._coils = [self._address]
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await self.async_base_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state from the coordinator's bulk read."""
+        state = self._hub.coordinator.get_bool(self._address, self._input_type)
+
+        self._attr_available = state is not None
+        if state is not None:
+            self._attr_is_on = state
+        self._async_publish()
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Update the state of the binary sensor."""
+        # remark "now" is a dummy parameter to avoid problems with
+        # async_track_time_interval
+        bits = await self._hub.async_read_bits(
+            self._address, call_type=self._input_type
+        )
+
+        self._attr_available = bits is not None
+        if bits is not None:
+            self._attr_is_on = bits[0]
+        self._async_publish()
@@ -0,0 +1,97 @@
+# Wago connection circuit breaker
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stop calling an unreachable gateway and probe it with backoff.
+
+    After threshold consecutive failed calls the breaker opens: on_open is
+    called once and calls are refused without reaching the gateway. The probe
+    is retried after min_backoff seconds, doubling up to max_backoff, until it
+    succeeds. Then the breaker closes and on_close is called.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        threshold: int,
+        probe: Callable[[], Awaitable[bool]],
+        on_open: Callable[[], None],
+        on_close: Callable[[], None],
+        min_backoff: float = 1,
+        max_backoff: float = 60,
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._threshold = threshold
+        self._probe = probe
+        self._on_open = on_open
+        self._on_close = on_close
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._task: asyncio.Task | None = None
+        self.failures = 0
+        self.trips = 0
+        self.backoff = 0.0
+        self.is_open = False
+
+    def record(self, ok: bool) -> None:
+        """Count the result of a call to the gateway."""
+        if ok:
+            self.failures = 0
+            return
+
+        self.failures += 1
+        if not self.is_open and self.failures >= self._threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.is_open = True
+        self.trips += 1
+        self.backoff = self._min_backoff
+        _LOGGER.warning(
+            f"WagoHub {self._name}: {self.failures} calls failed in a row, "
+            f"suspending polling until the gateway answers again"
+        )
+        self._on_open()
+        self._task = self._hass.async_create_background_task(
+            self._async_run(), f"wago {self._name} circuit breaker"
+        )
+
+    async def _async_run(self) -> None:
+        while True:
+            await asyncio.sleep(self.backoff)
+            try:
+                ok = await self._probe()
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.debug(f"WagoHub {self._name}: probe failed: {err}")
+                ok = False
+
+            if ok:
+                break
+
+            self.backoff = min(self.backoff * 2, self._max_backoff)
+            _LOGGER.debug(
+                f"WagoHub {self._name}: gateway unreachable, next probe in {self.backoff}s"
+            )
+
+        self._task = None
+        self.is_open = False
+        self.failures = 0
+        self.backoff = 0
+        _LOGGER.warning(f"WagoHub {self._name}: gateway answers again, resuming polling")
+        self._on_close()
+
+    async def async_close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
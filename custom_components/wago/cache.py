@@ -0,0 +1,80 @@
+# Wago read cache
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+ReadKey = tuple[str, int, int]
+
+
+class ReadCache:
+    """Single-flight reads with a short time to live.
+
+    Concurrent reads with the same call type, address and count share one
+    request. Results are kept for ttl seconds and dropped as soon as a write
+    overlaps them.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: float) -> None:
+        self._hass = hass
+        self._ttl = ttl
+        self._inflight: dict[ReadKey, asyncio.Future[list | None]] = {}
+        self._results: dict[ReadKey, tuple[float, list]] = {}
+
+    async def async_read(
+        self,
+        key: ReadKey,
+        fetch: Callable[[], Awaitable[list | None]],
+        on_join: Callable[[], None] | None = None,
+    ) -> list | None:
+        """Return a cached result, join an in-flight read or run fetch.
+
+        on_join is called when the read joins one that is already in flight.
+        """
+        if (cached := self._results.get(key)) is not None:
+            if cached[0] > self._hass.loop.time():
+                return cached[1]
+            del self._results[key]
+
+        if (future := self._inflight.get(key)) is not None:
+            if on_join is not None:
+                on_join()
+            return await asyncio.shield(future)
+
+        future = self._hass.loop.create_future()
+        self._inflight[key] = future
+        try:
+            result = await fetch()
+        except BaseException as err:
+            future.set_exception(err)
+            # the exception is delivered to the caller, not to the future
+            future.exception()
+            raise
+        finally:
+            # an overlapping write dropped the key while we were reading
+            valid = self._inflight.get(key) is future
+            if valid:
+                del self._inflight[key]
+
+        future.set_result(result)
+        if valid and result is not None and self._ttl > 0:
+            self._results[key] = (self._hass.loop.time() + self._ttl, result)
+
+        return result
+
+    def invalidate(self, call_type: str, addr: int, count: int) -> None:
+        """Drop cached and in-flight reads overlapping addr..addr + count - 1."""
+        end = addr + count
+
+        def overlaps(key: ReadKey) -> bool:
+            return key[0] == call_type and key[1] < end and addr < key[1] + key[2]
+
+        for key in [key for key in self._results if overlaps(key)]:
+            del self._results[key]
+        for key in [key for key in self._inflight if overlaps(key)]:
+            del self._inflight[key]
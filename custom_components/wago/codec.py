@@ -0,0 +1,159 @@
+# Wago register codecs
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+import struct
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_REGISTER_HOLDING,
+)
+
+from .const import (
+    DATA_TYPE_F32,
+    DATA_TYPE_I16,
+    DATA_TYPE_I32,
+    DATA_TYPE_U8,
+    DATA_TYPE_U16,
+    DATA_TYPE_U32,
+    FLAG_AREA,
+    ORDER_BIG,
+    ORDER_LITTLE,
+)
+
+# struct format character and size in registers of every data type
+DATA_TYPES: dict[str, tuple[str, int]] = {
+    DATA_TYPE_U8: ("H", 1),
+    DATA_TYPE_U16: ("H", 1),
+    DATA_TYPE_I16: ("h", 1),
+    DATA_TYPE_U32: ("I", 2),
+    DATA_TYPE_I32: ("i", 2),
+    DATA_TYPE_F32: ("f", 2),
+}
+
+ENDIAN = {ORDER_BIG: ">", ORDER_LITTLE: "<"}
+
+
+def flag_register(addr: int) -> tuple[int, int] | None:
+    """Return register and bit offset of the byte starting at coil addr.
+
+    WAGO maps the coils from FLAG_AREA on onto the bits of the registers from
+    FLAG_AREA on (%MX<n>.<b> is bit b of %MW<n>). None when the coils are not
+    aliased or the byte spans two registers.
+    """
+    if addr < FLAG_AREA:
+        return None
+
+    word, bit = divmod(addr - FLAG_AREA, 16)
+    if bit > 8:
+        return None
+
+    return FLAG_AREA + word, bit
+
+
+def flag_alias(call_type: str, addr: int, count: int) -> tuple[str, int, int] | None:
+    """Return the registers aliasing a range of coils in the flag area, or vice versa.
+
+    Returns call type, address and count of the other view, None when the
+    range lies below FLAG_AREA.
+    """
+    end = addr + count
+    if end <= FLAG_AREA:
+        return None
+
+    addr = max(addr, FLAG_AREA)
+    if call_type == CALL_TYPE_COIL:
+        first = FLAG_AREA + (addr - FLAG_AREA) // 16
+        last = FLAG_AREA + (end - 1 - FLAG_AREA) // 16
+        return CALL_TYPE_REGISTER_HOLDING, first, last - first + 1
+
+    return CALL_TYPE_COIL, FLAG_AREA + 16 * (addr - FLAG_AREA), 16 * (end - addr)
+
+
+@dataclass(frozen=True)
+class RegisterCodec:
+    """Encode and decode one value spread over consecutive registers.
+
+    byte_order is the order of the two bytes in a register, word_order the
+    order of the registers of a 32 bit value. A u8 is the byte at bit offset
+    shift of its register.
+    """
+
+    data_type: str = DATA_TYPE_U16
+    byte_order: str = ORDER_BIG
+    word_order: str = ORDER_BIG
+    shift: int = 0
+    count: int = field(init=False)
+    _value: struct.Struct = field(init=False, repr=False, compare=False)
+    _words: struct.Struct = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        fmt, count = DATA_TYPES[self.data_type]
+
+        object.__setattr__(self, "count", count)
+        object.__setattr__(self, "_value", struct.Struct(ENDIAN[self.word_order] + fmt))
+        object.__setattr__(
+            self, "_words", struct.Struct(f"{ENDIAN[self.buffer_order]}{count}H")
+        )
+
+    @property
+    def buffer_order(self) -> str:
+        """Order of the registers packed into a buffer.
+
+        The value is unpacked straight from the buffer in word order: swapping
+        the bytes of each register and swapping the words cancel out.
+        """
+        return ORDER_BIG if self.byte_order == self.word_order else ORDER_LITTLE
+
+    def unpack_from(self, buffer: bytes | memoryview, offset: int = 0) -> int | float:
+        """Decode the value at register offset of a buffer in buffer_order."""
+        value = self._value.unpack_from(buffer, 2 * offset)[0]
+        if self.data_type == DATA_TYPE_U8:
+            return value >> self.shift & 0xFF
+
+        return value
+
+    def decode(self, registers: Sequence[int]) -> int | float:
+        return self.unpack_from(self._words.pack(*registers[: self.count]))
+
+    def encode(self, value: int | float) -> list[int]:
+        """Return the registers holding value.
+
+        A u8 leaves the other bits of its register zero.
+        """
+        if self.data_type == DATA_TYPE_U8:
+            value = (int(value) & 0xFF) << self.shift
+
+        return list(self._words.unpack(self._value.pack(value)))
+
+
+class RegisterDecoder:
+    """Decode many values out of one block of registers in a single pass.
+
+    The block is packed once per buffer order the codecs need, each value is
+    unpacked from it with its codec's precomputed struct.
+    """
+
+    def __init__(self, count: int, fields: Iterable[tuple[int, RegisterCodec]]) -> None:
+        self.count = count
+        self.fields = tuple(fields)
+        self._words = {
+            order: struct.Struct(f"{ENDIAN[order]}{count}H")
+            for order in {codec.buffer_order for _, codec in self.fields}
+        }
+
+        for offset, codec in self.fields:
+            if offset < 0 or offset + codec.count > count:
+                raise ValueError(f"Field at offset {offset} exceeds block of {count} registers")
+
+    def decode(self, registers: Sequence[int]) -> list[int | float]:
+        buffers = {
+            order: words.pack(*registers[: self.count])
+            for order, words in self._words.items()
+        }
+
+        return [
+            codec.unpack_from(buffers[codec.buffer_order], offset)
+            for offset, codec in self.fields
+        ]
@@ -6,6 +6,7 @@ from homeassistant.const import (
     CONF_COVERS,
     CONF_LIGHTS,
     CONF_SENSORS,
+    CONF_SWITCHES,
     Platform,
 )
 
@@ -27,10 +28,44 @@ CONF_ADDRESS_REG_POSANG = "address_reg_posang"
 CONF_ERR_POS = "error_position"
 CONF_ERR_ANG = "error_angle"
 
+CONF_MAX_READ_GAP = "max_read_gap"
+CONF_PULSE_WIDTH = "pulse_width"
+CONF_WRITE_WINDOW = "write_window"
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_IDLE_CYCLES = "idle_cycles"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_QUEUE_DEPTH = "queue_depth"
+CONF_FAILURE_THRESHOLD = "failure_threshold"
+CONF_MAX_BACKOFF = "max_backoff"
+CONF_MAX_IN_FLIGHT = "max_in_flight"
+CONF_POOL_SIZE = "pool_size"
+CONF_COMMAND_DEBOUNCE = "command_debounce"
+CONF_PREDICTIVE = "predictive"
+CONF_OPTIMISTIC = "optimistic"
+CONF_CONFIRM_WINDOW = "confirm_window"
+CONF_POSITION_DEADBAND = "position_deadband"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_TRAVEL_TIME = "travel_time"
+CONF_TILT_TIME = "tilt_time"
+
+CONF_INPUT_TYPE = "input_type"
+CONF_DATA_TYPE = "data_type"
+CONF_BYTE_ORDER = "byte_order"
+CONF_WORD_ORDER = "word_order"
+CONF_SCALE = "scale"
+CONF_OFFSET = "offset"
+CONF_PRECISION = "precision"
+CONF_STATE_CLASS = "state_class"
+
 # dispatcher signals
 SIGNAL_STOP_ENTITY = "wago.stop"
 SIGNAL_START_ENTITY = "wago.start"
 SERVICE_STOP = "stop"
+SERVICE_DIAGNOSTICS = "diagnostics"
+SERVICE_SET_COVERS = "set_covers"
+
+ATTR_COVERS = "covers"
 
 DEFAULT_HUB = "modbus_hub"
 DEFAULT_SCAN_INTERVAL = 15
@@ -41,9 +76,66 @@ DEFAULT_ERR_ANG = 5
 
 DEFAULT_COVER_CLASS = "shutter"
 
+DEFAULT_MAX_READ_GAP = 8
+DEFAULT_PULSE_WIDTH = timedelta(milliseconds=200)
+DEFAULT_WRITE_WINDOW = timedelta(milliseconds=20)
+DEFAULT_FAST_SCAN_INTERVAL = 1
+# idle entities back off up to max_scan_interval, but never beyond their own
+# scan_interval by default: raising it trades latency of changes made at the
+# PLC, e.g. a wall switch, for bus load
+DEFAULT_MAX_SCAN_INTERVAL = 0
+DEFAULT_IDLE_CYCLES = 3
+DEFAULT_CACHE_TTL = timedelta(milliseconds=500)
+DEFAULT_QUEUE_DEPTH = 100
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_MAX_BACKOFF = timedelta(minutes=1)
+DEFAULT_MAX_IN_FLIGHT = 1
+DEFAULT_POOL_SIZE = 1
+DEFAULT_COMMAND_DEBOUNCE = timedelta(milliseconds=100)
+DEFAULT_CONFIRM_WINDOW = timedelta(seconds=5)
+DEFAULT_POSITION_DEADBAND = 2
+DEFAULT_PUBLISH_INTERVAL = timedelta(seconds=2)
+
+# pulse engine resolution in seconds
+PULSE_TICK = 0.01
+# cover motion monitor poll interval in seconds
+MOTION_INTERVAL = 1
+# longest gap between the confirmation reads of a predicted cover move
+MOTION_CONFIRM_INTERVAL = 10
+# first probe of an unreachable gateway in seconds, doubled up to max_backoff
+BREAKER_MIN_BACKOFF = 1
+# health check interval of the connection pool sessions in seconds
+POOL_HEALTH_INTERVAL = 30
+
+# request priorities, lowest value first
+PRIORITY_COMMAND = 0
+PRIORITY_MOTION = 1
+PRIORITY_POLL = 2
+
+# WAGO maps the coils from 0x3000 on onto the bits of the registers from
+# 0x3000 on (%MX<n>.<b> is bit b of %MW<n>)
+FLAG_AREA = 0x3000
+
+# register data types and byte / word orders
+DATA_TYPE_U8 = "u8"
+DATA_TYPE_U16 = "u16"
+DATA_TYPE_I16 = "i16"
+DATA_TYPE_U32 = "u32"
+DATA_TYPE_I32 = "i32"
+DATA_TYPE_F32 = "f32"
+ORDER_BIG = "big"
+ORDER_LITTLE = "little"
+
+# modbus protocol limits
+MAX_READ_COILS = 2000
+MAX_READ_REGISTERS = 125
+MAX_WRITE_COILS = 1968
+MAX_WRITE_REGISTERS = 123
+
 PLATFORMS = (
-    #    (Platform.BINARY_SENSOR, CONF_BINARY_SENSORS),
+    (Platform.BINARY_SENSOR, CONF_BINARY_SENSORS),
     (Platform.COVER, CONF_COVERS),
     (Platform.LIGHT, CONF_LIGHTS),
-    #    (Platform.SENSOR, CONF_SENSORS),
+    (Platform.SENSOR, CONF_SENSORS),
+    (Platform.SWITCH, CONF_SWITCHES),
 )
@@ -0,0 +1,412 @@
+# Wago bulk poll coordinator
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import math
+import random
+from typing import TYPE_CHECKING
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import MAX_READ_COILS, MAX_READ_REGISTERS, PRIORITY_POLL
+from .codec import RegisterCodec
+from .image import BIT_CALL_TYPES, ProcessImage
+from .plan import ReadPlan, build_read_plan, value_ranges
+
+if TYPE_CHECKING:
+    from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PollListener:
+    """Poll state of one entity registered with the coordinator."""
+
+    coils: frozenset[int]
+    registers: frozenset[int]
+    scan_interval: int
+    interval: float
+    next_due: float = 0
+    phase: float = 0
+    idle: int = 0
+    blocks: tuple[int, ...] = ()
+    signature: tuple | None = None
+    discrete_inputs: frozenset[int] = frozenset()
+    input_registers: frozenset[int] = frozenset()
+    adaptive: bool = True
+
+
+class WagoCoordinator:
+    """Poll the addresses of all registered entities of a hub.
+
+    Every entity has its own adaptive interval: it drops to fast_interval
+    while the entity is active and doubles, up to max_interval or the scan
+    interval of the entity if that is longer, every idle_cycles polls
+    without a change. With the default max_interval of 0 idle entities
+    settle at their scan interval, so back-off beyond it is opt-in. Entities
+    registered as not adaptive, like sensors, keep their scan interval. Each
+    tick only the blocks of the read plan covering a due entity are read, and
+    every entity whose blocks were all read is updated along with them.
+
+    Entities are polled in slots instead of whenever they were added: groups
+    of entities sharing block reads get the same slot, and the groups are
+    spread over the slots by their number of frames, so the gateway sees a
+    steady frame rate.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: WagoHub,
+        max_gap: int = 0,
+        fast_interval: float = 1,
+        max_interval: float = 0,
+        idle_cycles: int = 3,
+    ) -> None:
+        self._hass = hass
+        self._hub = hub
+        self._max_gap = max_gap
+        self._fast_interval = fast_interval
+        self._max_interval = max_interval
+        self._idle_cycles = idle_cycles
+        self._listeners: dict[CALLBACK_TYPE, PollListener] = {}
+        self.plan = ReadPlan(max_gap=max_gap)
+        self.image = ProcessImage(self.plan)
+        self._refreshing = False
+        self._suspended = False
+        self._cancel_timer: Callable[[], None] | None = None
+        self._cancel_call: Callable[[], None] | None = None
+        # random per hub, so the slots of several hubs do not coincide
+        self._origin = hass.loop.time() + random.uniform(0, fast_interval)
+
+    @callback
+    def async_add_listener(
+        self,
+        update_callback: CALLBACK_TYPE,
+        coils: Iterable[int],
+        registers: Iterable[int],
+        scan_interval: int,
+        discrete_inputs: Iterable[int] = (),
+        input_registers: Iterable[int] = (),
+        adaptive: bool = True,
+    ) -> Callable[[], None]:
+        """Register the addresses of an entity and poll them with the hub."""
+        self._listeners[update_callback] = PollListener(
+            frozenset(coils),
+            frozenset(registers),
+            scan_interval,
+            scan_interval,
+            discrete_inputs=frozenset(discrete_inputs),
+            input_registers=frozenset(input_registers),
+            adaptive=adaptive,
+        )
+        self._async_rebuild()
+        self.async_schedule_refresh()
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(update_callback, None)
+            self._async_rebuild()
+
+        return remove_listener
+
+    @callback
+    def _async_rebuild(self) -> None:
+        coils: set[int] = set()
+        registers: set[int] = set()
+        discrete_inputs: set[int] = set()
+        input_registers: set[int] = set()
+        # the neighbouring addresses of an entity hold multi-register values or
+        # bytes of coils, a block must not end in the middle of one
+        values: set[tuple[str, int, int]] = set()
+        for listener in self._listeners.values():
+            coils |= listener.coils
+            registers |= listener.registers
+            discrete_inputs |= listener.discrete_inputs
+            input_registers |= listener.input_registers
+            for call_type, addresses, max_count in (
+                (CALL_TYPE_COIL, listener.coils, MAX_READ_COILS),
+                (CALL_TYPE_DISCRETE, listener.discrete_inputs, MAX_READ_COILS),
+                (CALL_TYPE_REGISTER_HOLDING, listener.registers, MAX_READ_REGISTERS),
+                (CALL_TYPE_REGISTER_INPUT, listener.input_registers, MAX_READ_REGISTERS),
+            ):
+                values.update(
+                    (call_type, start, count)
+                    for start, count in value_ranges(addresses, max_count)
+                )
+
+        if (
+            coils != self.plan.coils
+            or registers != self.plan.registers
+            or discrete_inputs != self.plan.discrete_inputs
+            or input_registers != self.plan.input_registers
+            or values != self.plan.values
+        ):
+            self.plan = build_read_plan(
+                coils,
+                registers,
+                self._max_gap,
+                discrete_inputs,
+                input_registers,
+                values,
+            )
+            self.image = ProcessImage(self.plan)
+            _LOGGER.debug(
+                f"WagoHub {self._hub.name}: read plan {self.plan.frames} frames: {self.plan.blocks}"
+            )
+
+        for listener in self._listeners.values():
+            listener.blocks = self.plan.blocks_for(
+                listener.coils,
+                listener.registers,
+                listener.discrete_inputs,
+                listener.input_registers,
+            )
+        self._assign_slots()
+
+        if self._listeners and self._cancel_timer is None:
+            self._cancel_timer = async_track_time_interval(
+                self._hass, self._async_tick, timedelta(seconds=self._fast_interval)
+            )
+        elif not self._listeners and self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+    def _assign_slots(self) -> None:
+        """Spread the groups of listeners sharing blocks evenly over the slots."""
+        parent: dict[int, int] = {}
+
+        def find(index: int) -> int:
+            while parent.setdefault(index, index) != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        listeners = [
+            listener for listener in self._listeners.values() if listener.blocks
+        ]
+        for listener in listeners:
+            for index in listener.blocks[1:]:
+                parent[find(index)] = find(listener.blocks[0])
+
+        groups: dict[int, list[PollListener]] = {}
+        for listener in listeners:
+            groups.setdefault(find(listener.blocks[0]), []).append(listener)
+        if not groups:
+            return
+
+        slots = max(
+            1,
+            round(
+                max(listener.scan_interval for listener in listeners)
+                / self._fast_interval
+            ),
+        )
+        frames = {
+            root: len({index for listener in group for index in listener.blocks})
+            for root, group in groups.items()
+        }
+        load = [0] * slots
+        for root in sorted(groups, key=frames.__getitem__, reverse=True):
+            slot = load.index(min(load))
+            load[slot] += frames[root]
+            for listener in groups[root]:
+                listener.phase = slot / slots
+
+    def _next_slot(self, listener: PollListener, time: float) -> float:
+        """Return the first slot of a listener after time."""
+        interval = listener.interval
+        if interval <= 0:
+            return time
+
+        offset = self._origin + listener.phase * interval
+        return offset + (math.floor((time - offset) / interval) + 1) * interval
+
+    @callback
+    def async_schedule_refresh(self) -> None:
+        """Refresh soon, merging requests of entities added together."""
+        if self._cancel_call is not None:
+            return
+
+        @callback
+        def _refresh(now: datetime) -> None:
+            self._cancel_call = None
+            self._hass.async_create_task(self.async_refresh())
+
+        self._cancel_call = async_call_later(
+            self._hass, timedelta(milliseconds=100), _refresh
+        )
+
+    @callback
+    def async_boost(self, update_callback: CALLBACK_TYPE) -> None:
+        """Poll an entity at the fast interval, e.g. after a command."""
+        if (listener := self._listeners.get(update_callback)) is None:
+            return
+
+        listener.interval = self._fast_interval
+        listener.idle = 0
+        listener.next_due = min(
+            listener.next_due, self._hass.loop.time() + self._fast_interval
+        )
+
+    @callback
+    def async_suspend(self) -> None:
+        """Stop polling and mark every entity unavailable, e.g. gateway lost."""
+        self._suspended = True
+        for index in range(len(self.plan.blocks)):
+            self.image.invalidate(index)
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_resume(self) -> None:
+        """Resume polling with one refresh of every entity."""
+        self._suspended = False
+        self._hass.async_create_task(self.async_refresh())
+
+    @callback
+    def async_stop(self) -> None:
+        if self._cancel_call:
+            self._cancel_call()
+            self._cancel_call = None
+        if self._cancel_timer:
+            self._cancel_timer()
+            self._cancel_timer = None
+
+    def get_bool(self, addr: int, call_type: str = CALL_TYPE_COIL) -> bool | None:
+        return self.image.get_bool(addr, call_type)
+
+    def get_u8(self, addr: int) -> int | None:
+        return self.image.get_u8(addr)
+
+    def get_register(
+        self, addr: int, call_type: str = CALL_TYPE_REGISTER_HOLDING
+    ) -> int | None:
+        return self.image.get_register(addr, call_type)
+
+    def get_value(
+        self,
+        addr: int,
+        codec: RegisterCodec,
+        call_type: str = CALL_TYPE_REGISTER_HOLDING,
+    ) -> int | float | None:
+        return self.image.get_value(addr, codec, call_type)
+
+    async def _async_tick(self, now: datetime | None = None) -> None:
+        if self._suspended:
+            return
+
+        time = self._hass.loop.time()
+        due = [
+            update_callback
+            for update_callback, listener in self._listeners.items()
+            if listener.scan_interval > 0 and listener.next_due <= time
+        ]
+        if due:
+            await self._async_poll(due)
+
+    async def async_refresh(self, now: datetime | None = None) -> None:
+        """Poll every registered entity."""
+        await self._async_poll(list(self._listeners))
+
+    async def _async_poll(self, update_callbacks: list[CALLBACK_TYPE]) -> None:
+        """Run the blocks of the read plan the entities need and notify them."""
+        if self._refreshing:
+            # poll them with the next tick
+            for update_callback in update_callbacks:
+                if (listener := self._listeners.get(update_callback)) is not None:
+                    listener.next_due = 0
+            return
+
+        self._refreshing = True
+        start = self._hass.loop.time()
+        try:
+            image = self.image
+            blocks = sorted(
+                {
+                    index
+                    for update_callback in update_callbacks
+                    if update_callback in self._listeners
+                    for index in self._listeners[update_callback].blocks
+                }
+            )
+            for index in blocks:
+                block = image.plan.blocks[index]
+                if block.call_type in BIT_CALL_TYPES:
+                    bits = await self._hub.async_read_bits(
+                        block.start, block.count, PRIORITY_POLL, block.call_type
+                    )
+                    if bits is None:
+                        image.invalidate(index)
+                        continue
+                    image.write_bits(index, bits)
+                else:
+                    registers = await self._hub.async_read_registers(
+                        block.start, block.count, PRIORITY_POLL, block.call_type
+                    )
+                    if registers is None:
+                        image.invalidate(index)
+                        continue
+                    image.write_registers(index, registers)
+        finally:
+            self._refreshing = False
+
+        time = self._hass.loop.time()
+        self._hub.stats.record_cycle(time - start)
+
+        if image is not self.image:
+            # the read plan changed while reading, the new image holds none of
+            # these values yet: poll the entities again instead of notifying
+            for update_callback in update_callbacks:
+                if (listener := self._listeners.get(update_callback)) is not None:
+                    listener.next_due = 0
+            return
+
+        # entities whose blocks were all read along get fresh values for free
+        read = set(blocks)
+        update_callbacks = list(update_callbacks) + [
+            update_callback
+            for update_callback, listener in self._listeners.items()
+            if update_callback not in update_callbacks
+            and listener.blocks
+            and read.issuperset(listener.blocks)
+        ]
+
+        for update_callback in update_callbacks:
+            if (listener := self._listeners.get(update_callback)) is None:
+                continue
+
+            self._adapt(listener)
+            listener.next_due = self._next_slot(listener, time)
+            update_callback()
+
+    def _adapt(self, listener: PollListener) -> None:
+        if not listener.adaptive:
+            return
+
+        signature = tuple(self.image.get_bool(addr) for addr in sorted(listener.coils))
+        signature += tuple(self.image.get_register(addr) for addr in sorted(listener.registers))
+
+        if signature != listener.signature:
+            listener.signature = signature
+            listener.idle = 0
+            listener.interval = min(listener.interval, listener.scan_interval)
+            return
+
+        listener.idle += 1
+        if listener.idle >= self._idle_cycles:
+            listener.idle = 0
+            listener.interval = min(
+                listener.interval * 2, max(self._max_interval, listener.scan_interval)
+            )
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 import logging
 import asyncio
-import struct
+
+import voluptuous as vol
 
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     CONF_COVERS,
     CONF_NAME,
     STATE_CLOSED,
@@ -15,14 +17,19 @@ from homeassistant.const import (
     STATE_OPENING,
 )
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.components.modbus.const import CALL_TYPE_REGISTER_HOLDING
 from homeassistant.components.cover import (
+    ATTR_CURRENT_POSITION,
+    ATTR_CURRENT_TILT_POSITION,
     CoverEntity,
     CoverEntityFeature,
     ATTR_POSITION,
     ATTR_TILT_POSITION,
 )
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
@@ -31,15 +38,46 @@ from .util import percent_to_u8, u8_to_percent
 from .wago import WagoHub
 from .entity import BasePlatform
 from .const import (
+    WAGO_DOMAIN as DOMAIN,
+    ATTR_COVERS,
+    MOTION_INTERVAL,
+    SERVICE_SET_COVERS,
     CONF_ADDRESS_SET,
     CONF_ADDRESS_REG_PA,
     CONF_ADDRESS_REG_POSANG,
     CONF_ERR_POS,
     CONF_ERR_ANG,
+    CONF_PREDICTIVE,
+    CONF_TRAVEL_TIME,
+    CONF_TILT_TIME,
+    CONF_POSITION_DEADBAND,
+    CONF_PUBLISH_INTERVAL,
 )
 
+from .travel import TravelModel
+
 _LOGGER = logging.getLogger(__name__)
 
+PERCENT = vol.All(vol.Coerce(int), vol.Range(min=0, max=100))
+
+SET_COVERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_COVERS): vol.All(
+            cv.ensure_list,
+            [
+                vol.All(
+                    {
+                        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+                        vol.Optional(ATTR_POSITION): PERCENT,
+                        vol.Optional(ATTR_TILT_POSITION): PERCENT,
+                    },
+                    cv.has_at_least_one_key(ATTR_POSITION, ATTR_TILT_POSITION),
+                )
+            ],
+        )
+    }
+)
+
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -58,6 +96,86 @@ async def async_setup_platform(
 
     async_add_entities(covers)
 
+    if hass.services.has_service(DOMAIN, SERVICE_SET_COVERS):
+        return
+
+    async def async_handle_set_covers(call: ServiceCall) -> None:
+        """Move the given covers to their targets together."""
+        entities: dict[str, WagoCover] = {}
+        for hub in hass.data[DOMAIN].values():
+            entities.update(hub.covers)
+
+        moves = []
+        for target in call.data[ATTR_COVERS]:
+            for entity_id in target[ATTR_ENTITY_ID]:
+                if (cover := entities.get(entity_id)) is None:
+                    _LOGGER.warning(f"set_covers: {entity_id} is not a WAGO cover")
+                    continue
+
+                pos = target.get(ATTR_POSITION, cover.current_cover_position)
+                ang = target.get(ATTR_TILT_POSITION, cover.current_cover_tilt_position)
+                if pos is None or ang is None:
+                    # the other axis would be driven to 0
+                    _LOGGER.warning(
+                        f"set_covers: {entity_id} position unknown, give both axes"
+                    )
+                    continue
+
+                moves.append((cover, pos, ang))
+
+        await async_set_covers(moves)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_COVERS, async_handle_set_covers, schema=SET_COVERS_SCHEMA
+    )
+
+
+async def async_set_covers(moves: list[tuple[WagoCover, int, int]]) -> None:
+    """Move many covers at once, hub by hub."""
+    hubs: dict[WagoHub, list[tuple[WagoCover, int, int]]] = {}
+    for move in moves:
+        hubs.setdefault(move[0]._hub, []).append(move)
+
+    await asyncio.gather(*(_async_set_hub_covers(hub, moves) for hub, moves in hubs.items()))
+
+
+async def _async_set_hub_covers(
+    hub: WagoHub, moves: list[tuple[WagoCover, int, int]]
+) -> None:
+    """Write all PA registers through the write queue, which merges them into
+    as few frames as possible, pulse all set coils together and track the
+    covers with the hub's motion monitor."""
+    written = await asyncio.gather(
+        *(
+            hub.async_write_registers(cover._address_soll, [cover._prepare_move(pos, ang)])
+            for cover, pos, ang in moves
+        )
+    )
+
+    # Toggle Set
+    moving = [move for move, ret in zip(moves, written) if ret]
+    pulsed = await asyncio.gather(
+        *(hub.async_pulse(cover._address_set, cover._pulse_width) for cover, _, _ in moving)
+    )
+    moving = [move for move, ret in zip(moving, pulsed) if ret]
+
+    arrived = await asyncio.gather(
+        *(cover._track_move(pos, ang) for cover, pos, ang in moving)
+    )
+
+    # the last position read of a finished move is the final state, only the
+    # covers that failed are read again, all in one poll
+    done = {cover for (cover, _, _), ret in zip(moving, arrived) if ret}
+    failed = [cover for cover, _, _ in moves if cover not in done]
+    for cover in done:
+        cover._update_position(
+            (cover._attr_current_cover_position, cover._attr_current_cover_tilt_position)
+        )
+    if failed:
+        for cover in failed:
+            hub.invalidate(CALL_TYPE_REGISTER_HOLDING, cover._address_ist, 1)
+        await hub.coordinator.async_refresh()
+
 
 class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
     _attr_supported_features = (
@@ -82,12 +200,28 @@ class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
 
         self._err_pos = int(config[CONF_ERR_POS])
         self._err_ang = int(config[CONF_ERR_ANG])
+        self._deadband = int(config[CONF_POSITION_DEADBAND])
+        self._publish_interval = config[CONF_PUBLISH_INTERVAL].total_seconds()
 
         self._attr_is_closed = False
 
+        self._registers = [self._address_ist]
+
+        self._travel: TravelModel | None = None
+        if config[CONF_PREDICTIVE]:
+            travel_time = config.get(CONF_TRAVEL_TIME)
+            tilt_time = config.get(CONF_TILT_TIME)
+            self._travel = TravelModel(
+                travel_time.total_seconds() if travel_time else None,
+                tilt_time.total_seconds() if tilt_time else None,
+            )
+        self._move_task: asyncio.Task[bool] | None = None
+
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await self.async_base_added_to_hass()
+        self._hub.covers[self.entity_id] = self
+        self.async_on_remove(lambda: self._hub.covers.pop(self.entity_id, None))
         if state := await self.async_get_last_state():
             if state == STATE_CLOSED:
                 self._attr_is_closed = True
@@ -106,7 +240,8 @@ class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
                 self._attr_is_closing = False
                 self._attr_is_opening = False
 
-    async def _set_position(self, pos: int, ang: int) -> bool:
+    def _encode_position(self, pos: int, ang: int) -> int:
+        """Return the PA register value of a target, clamped to 0..100."""
         if pos < 0:
             _LOGGER.warning(
                 f"WagoCover: {
@@ -140,78 +275,149 @@ class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
 
         _LOGGER.debug(f"Set Position: pos: {pos_u8} ang: {ang_u8}")
 
-        data = struct.pack('>BB', ang_u8, pos_u8)
+        return ang_u8 << 8 | pos_u8
 
-        # write to the bus
-        ret = await self._hub.async_write_register(self._address_soll, data)
-        if not ret:
-            return False
+    @callback
+    def _prepare_move(self, pos: int, ang: int) -> int:
+        """Cancel the running move and return the PA register value of a new one."""
+        self._cancel_move()
+        value = self._encode_position(pos, ang)
 
-        # Toggle Set
-        ret = await self._hub.async_write_bool(self._address_set, True)
-        if not ret:
-            return False
+        # a predicted move is confirmed sparsely by the motion monitor, the
+        # coordinator must not poll it at the fast interval meanwhile
+        if self._travel is None:
+            self._async_boost()
 
-        await asyncio.sleep(0.2)
+        return value
 
-        ret = await self._hub.async_write_bool(self._address_set, False)
+    async def _set_position(self, pos: int, ang: int) -> bool:
+        value = self._prepare_move(pos, ang)
+
+        # write to the bus
+        ret = await self._hub.async_write_registers(self._address_soll, [value])
         if not ret:
             return False
 
-        return True
+        # Toggle Set
+        return await self._hub.async_pulse(self._address_set, self._pulse_width)
 
     async def _set_position_and_wait(self, pos: int, ang: int) -> bool:
         ret = await self._set_position(pos, ang)
         if not ret:
             return False
 
-        current_pos, current_ang = await self._get_position()
-        if current_pos is None or current_ang is None:
-            return False
+        if self._optimistic and (current := self._attr_current_cover_position) is not None:
+            # publish the direction before the first position read
+            self._attr_is_closing = pos < current
+            self._attr_is_opening = pos > current
+            self._async_publish()
 
-        if current_pos > pos:
-            self._attr_is_closing = True
-            self._attr_is_opening = False
-        elif current_pos < pos:
-            self._attr_is_closing = False
-            self._attr_is_opening = True
+        return await self._track_move(pos, ang)
+
+    async def _track_move(self, pos: int, ang: int) -> bool:
+        """Wait for the cover in its single move task.
+
+        Returns False when a newer command or stop cancelled the move.
+        """
+        self._cancel_move()
+        self._move_task = task = self.hass.async_create_task(
+            self._wait_position(pos, ang)
+        )
 
         try:
-            async with asyncio.timeout(self._timeout.total_seconds()):
-                while True:
-                    current_pos, current_ang = await self._get_position()
-                    if current_pos is None or current_ang is None:
-                        return False
+            return await task
+        except asyncio.CancelledError:
+            if (current := asyncio.current_task()) is not None and current.cancelling():
+                raise
+            return False
+        finally:
+            if self._move_task is task:
+                self._move_task = None
+
+    @callback
+    def _cancel_move(self) -> None:
+        """Cancel the running move, which stops polling its position."""
+        if self._move_task is None:
+            return
 
-                    self._attr_current_cover_position = current_pos
-                    self._attr_current_cover_tilt_position = current_ang
+        self._move_task.cancel()
+        self._move_task = None
+        self._attr_is_closing = False
+        self._attr_is_opening = False
 
-                    self.async_write_ha_state()
+    async def _wait_position(self, pos: int, ang: int) -> bool:
+        loop = self.hass.loop
+        travel = self._travel
+        origin = (self._attr_current_cover_position, self._attr_current_cover_tilt_position)
+        if origin[0] is None or origin[1] is None:
+            travel = None
+
+        next_read = None
+        cancel_interpolate = None
+        if travel is not None:
+            travel.start(loop.time(), origin, (pos, ang))
+            next_read = lambda: travel.next_read(loop.time())
+
+            @callback
+            def _interpolate(now: datetime) -> None:
+                predicted_pos, predicted_ang = travel.predict(loop.time())
+                self._attr_current_cover_position = round(predicted_pos)
+                self._attr_current_cover_tilt_position = round(predicted_ang)
+                self._async_publish()
+
+            cancel_interpolate = async_track_time_interval(
+                self.hass, _interpolate, timedelta(seconds=MOTION_INTERVAL)
+            )
 
-                    delta_pos = abs(pos - current_pos)
-                    delta_ang = abs(ang - current_ang)
+        @callback
+        def _track_position(value: int) -> bool:
+            current_pos, current_ang = self._decode_position(value)
+            if travel is not None:
+                travel.observe(loop.time(), (current_pos, current_ang))
 
-                    if delta_pos <= self._err_pos and delta_ang <= self._err_ang:
-                        break
+            if current_pos > pos:
+                self._attr_is_closing = True
+                self._attr_is_opening = False
+            elif current_pos < pos:
+                self._attr_is_closing = False
+                self._attr_is_opening = True
+
+            self._attr_current_cover_position = current_pos
+            self._attr_current_cover_tilt_position = current_ang
 
-                    await asyncio.sleep(1)
+            self._async_publish()
 
+            delta_pos = abs(pos - current_pos)
+            delta_ang = abs(ang - current_ang)
+
+            return delta_pos <= self._err_pos and delta_ang <= self._err_ang
+
+        try:
+            ret = await self._hub.motion.async_track(
+                self._address_ist,
+                _track_position,
+                self._timeout.total_seconds(),
+                next_read,
+            )
         except asyncio.TimeoutError as e:
             _LOGGER.warning(f"{self.name} Timedout while waiting for jal to reach target: pos: {
                             pos}, ang: {ang}")
             return False
+        finally:
+            if travel is not None:
+                cancel_interpolate()
+                travel.stop()
+
+        if not ret:
+            return False
 
         self._attr_is_closing = False
         self._attr_is_opening = False
 
         return True
 
-    async def _get_position(self) -> tuple[int, int] | None:
-        data = await self._hub.async_read_register(self._address_ist)
-        if data is None:
-            return None
-
-        ang_u8, pos_u8 = struct.unpack('>BB', data)
+    def _decode_position(self, value: int) -> tuple[int, int]:
+        ang_u8, pos_u8 = value >> 8, value & 0xFF
 
         # ang_u8 *= 1.125
 
@@ -222,87 +428,113 @@ class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
 
         return pos, ang
 
+    async def _get_position(self) -> tuple[int, int] | None:
+        registers = await self._hub.async_read_registers(self._address_ist)
+        if registers is None:
+            return None
+
+        return self._decode_position(registers[0])
+
+    async def _async_move(self, pos: int, ang: int) -> None:
+        result = await self._set_position_and_wait(pos, ang)
+
+        if result and self._optimistic:
+            # the last position read of the move confirmed the target
+            self._update_position(
+                (self._attr_current_cover_position, self._attr_current_cover_tilt_position)
+            )
+            return
+
+        self._attr_available = result is not None
+        await self._async_readback()
+
+    async def _async_stop(self) -> None:
+        self._cancel_move()
+        position = await self._get_position()
+        if position is None:
+            self._attr_available = False
+            await self._async_readback()
+            return
+
+        result = await self._set_position(*position)
+        self._attr_available = result is not None
+        await self._async_readback()
+
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open cover."""
-        result = await self._set_position_and_wait(100, 100)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(100, 100))
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
-        result = await self._set_position_and_wait(0, 0)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(0, 0))
 
     async def async_stop_cover(self, **kwargs) -> None:
         """Stop the cover."""
-        pos, ang = await self._get_position()
-        if pos is None or ang is None:
-            self._attr_available = False
-            await self.async_update()
-            return
-        
-        result = await self._set_position(pos, ang)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(self._async_stop, immediate=True)
 
     async def async_set_cover_position(self, **kwargs) -> None:
         """Move the cover to a specific position."""
         pos = int(kwargs.get(ATTR_POSITION))
         ang = self._attr_current_cover_tilt_position
 
-        result = await self._set_position_and_wait(pos, ang)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(pos, ang))
 
     async def async_open_cover_tilt(self, **kwargs) -> None:
         """Open the cover tilt."""
         pos = self._attr_current_cover_position
 
-        result = await self._set_position_and_wait(pos, 100)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(pos, 100))
 
     async def async_close_cover_tilt(self, **kwargs) -> None:
         """Close the cover tilt."""
         pos = self._attr_current_cover_position
 
-        result = await self._set_position_and_wait(pos, 0)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(pos, 0))
 
     async def async_stop_cover_tilt(self, **kwargs) -> None:
         """Stop the cover tilt."""
-        pos, ang = await self._get_position()
-        if pos is None or ang is None:
-            self._attr_available = False
-            await self.async_update()
-            return
-        
-        result = await self._set_position(pos, ang)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(self._async_stop, immediate=True)
 
     async def async_set_cover_tilt_position(self, **kwargs) -> None:
         """Move the cover tilt to a specific position."""
         ang = int(kwargs.get(ATTR_TILT_POSITION))
         pos = self._attr_current_cover_position
 
-        result = await self._set_position_and_wait(pos, ang)
-        self._attr_available = result is not None
-        await self.async_update()
+        await self._commands.async_call(lambda: self._async_move(pos, ang))
 
-    async def async_update(self, now: datetime | None = None) -> None:
-        """Update the state of the cover."""
-        # remark "now" is a dummy parameter to avoid problems with
-        # async_track_time_interval
-        pos, ang = await self._get_position()
-        if pos is None or ang is None:
+    def _should_publish(self, previous: tuple | None, snapshot: tuple) -> bool:
+        """Throttle position updates while moving, settled states always go out."""
+        if previous == snapshot:
+            return False
+        if previous is None or not (self._attr_is_opening or self._attr_is_closing):
+            return True
+        # availability or state, e.g. opening to closing
+        if previous[:2] != snapshot[:2]:
+            return True
+        if self.hass.loop.time() - self._published_at < self._publish_interval:
+            return False
+
+        old, new = previous[2] or {}, snapshot[2] or {}
+        return any(
+            abs((new.get(attr) or 0) - (old.get(attr) or 0)) >= self._deadband
+            for attr in (ATTR_CURRENT_POSITION, ATTR_CURRENT_TILT_POSITION)
+        )
+
+    @callback
+    def async_hold(self, update: bool = True) -> None:
+        """Remote stop entity."""
+        self._cancel_move()
+        super().async_hold(update)
+
+    @callback
+    def _update_position(self, position: tuple[int, int] | None) -> None:
+        if position is None:
             self._attr_available = False
-            self.async_write_ha_state()
+            self._async_publish()
             return
         self._attr_available = True
 
+        pos, ang = position
         self._attr_current_cover_position = pos
         self._attr_current_cover_tilt_position = ang
 
@@ -317,4 +549,28 @@ class WagoCover(BasePlatform, CoverEntity, RestoreEntity):
         else:
             self._attr_is_closed = False
 
-        self.async_write_ha_state()
+        self._async_publish()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state from the coordinator's bulk read."""
+        value = self._hub.coordinator.get_register(self._address_ist)
+        if value is None:
+            self._update_position(None)
+            return
+
+        pos, ang = self._decode_position(value)
+        if self._move_task is None and self._attr_current_cover_position is not None and (
+            pos != self._attr_current_cover_position
+            or ang != self._attr_current_cover_tilt_position
+        ):
+            # moving, e.g. by a wall switch
+            self._async_boost()
+
+        self._update_position((pos, ang))
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Update the state of the cover."""
+        # remark "now" is a dummy parameter to avoid problems with
+        # async_track_time_interval
+        self._update_position(await self._get_position())
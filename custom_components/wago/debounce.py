@@ -0,0 +1,76 @@
+# Wago command debouncer
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandDebouncer:
+    """Coalesce a stream of commands of one entity, the latest one wins.
+
+    A command waits window seconds before it runs. A newer command arriving
+    meanwhile supersedes it: the superseded call returns False at once
+    without touching the bus, so dragging a slider only writes the final
+    target.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        self._hass = hass
+        self._window = window
+        self._pending: asyncio.Future[bool] | None = None
+        self._handle: asyncio.TimerHandle | None = None
+
+    async def async_call(
+        self, command: Callable[[], Awaitable[object]], immediate: bool = False
+    ) -> bool:
+        """Run command once the window passed, False if it was superseded."""
+        self._supersede()
+
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._pending = future
+        if immediate or self._window <= 0:
+            future.set_result(True)
+        else:
+            self._handle = self._hass.loop.call_later(
+                self._window, self._release, future
+            )
+
+        try:
+            if not await future:
+                return False
+        finally:
+            if self._pending is future:
+                self._cancel_timer()
+                self._pending = None
+
+        await command()
+        return True
+
+    @callback
+    def _release(self, future: asyncio.Future[bool]) -> None:
+        self._handle = None
+        if not future.done():
+            future.set_result(True)
+
+    @callback
+    def _supersede(self) -> None:
+        self._cancel_timer()
+        if self._pending is not None and not self._pending.done():
+            self._pending.set_result(False)
+        self._pending = None
+
+    @callback
+    def _cancel_timer(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending command, e.g. when the entity is removed."""
+        self._supersede()
@@ -0,0 +1,45 @@
+# Wago hub diagnostics
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .wago import WagoHub
+
+
+def async_get_hub_diagnostics(hub: WagoHub) -> dict[str, Any]:
+    """Return request statistics, breaker, pool and queue state and read plan of a hub."""
+    plan = hub.coordinator.plan
+
+    return {
+        "stats": hub.stats.as_dict(),
+        "breaker": {
+            "open": hub.breaker.is_open,
+            "failures": hub.breaker.failures,
+            "trips": hub.breaker.trips,
+            "backoff": hub.breaker.backoff,
+        },
+        "pool": [
+            {
+                "connected": session.connected,
+                "healthy": session.healthy,
+                "in_flight": session.in_flight,
+            }
+            for session in (hub.pool.sessions if hub.pool else [])
+        ],
+        "queue": {
+            "size": hub.queue.size,
+            "priorities": {
+                priority: {**asdict(stats), "wait_avg": stats.wait_avg}
+                for priority, stats in hub.queue.stats.items()
+            },
+        },
+        "read_plan": {
+            "frames": plan.frames,
+            "max_gap": plan.max_gap,
+            "coils": len(plan.coils),
+            "registers": len(plan.registers),
+            "blocks": [asdict(block) for block in plan.blocks],
+        },
+    }
@@ -6,6 +6,12 @@ from datetime import datetime, timedelta
 import logging
 from typing import Any, cast
 
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+)
 from homeassistant.const import (
     CONF_DEVICE_CLASS,
     CONF_NAME,
@@ -24,7 +30,13 @@ from .const import (
     SIGNAL_STOP_ENTITY,
     SIGNAL_START_ENTITY,
     CONF_TIMEOUT,
+    CONF_PULSE_WIDTH,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_OPTIMISTIC,
+    CONF_CONFIRM_WINDOW,
+    DEFAULT_CONFIRM_WINDOW,
 )
+from .debounce import CommandDebouncer
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,9 +47,26 @@ class BasePlatform(Entity):
         self._value: str = None
         self._scan_interval = int(entry[CONF_SCAN_INTERVAL])
         self._timeout: timedelta = entry[CONF_TIMEOUT]
+        self._pulse_width: timedelta = entry.get(CONF_PULSE_WIDTH)
+        self._commands = CommandDebouncer(
+            haas, entry.get(CONF_COMMAND_DEBOUNCE, timedelta()).total_seconds()
+        )
         self._call_active = False
         self._cancel_timer: Callable[[], None] | None = None
         self._cancel_call: Callable[[], None] | None = None
+        self._coils: list[int] = []
+        self._registers: list[int] = []
+        self._discrete_inputs: list[int] = []
+        self._input_registers: list[int] = []
+        self._adaptive = True
+        self._optimistic: bool = entry.get(CONF_OPTIMISTIC, False)
+        self._confirm_window: timedelta = entry.get(
+            CONF_CONFIRM_WINDOW, DEFAULT_CONFIRM_WINDOW
+        )
+        self._expected: dict[str, Any] | None = None
+        self._cancel_confirm: Callable[[], None] | None = None
+        self._published: tuple | None = None
+        self._published_at = 0.0
 
         self._attr_unique_id = entry.get(CONF_UNIQUE_ID)
         self._attr_name = entry[CONF_NAME]
@@ -49,24 +78,152 @@ class BasePlatform(Entity):
     async def async_update(self, now: datetime | None = None) -> None:
         """Virtual function to be overwritten."""
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Virtual function to be overwritten by entities polled by the coordinator."""
+
+    def _snapshot(self) -> tuple:
+        """Everything of the entity that ends up in its state object."""
+        return (
+            self.available,
+            self.state,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    def _should_publish(self, previous: tuple | None, snapshot: tuple) -> bool:
+        """Whether a snapshot differs enough from the published one."""
+        return previous != snapshot
+
+    @callback
+    def _async_publish(self, force: bool = False) -> None:
+        """Write the state to Home Assistant, but only when it changed."""
+        snapshot = self._snapshot()
+        if not force and not self._should_publish(self._published, snapshot):
+            return
+
+        self._published = snapshot
+        self._published_at = self.hass.loop.time()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_optimistic(self, expected: dict[str, Any]) -> None:
+        """Publish a commanded state at once and confirm it with the coordinator.
+
+        expected maps attribute names to the commanded values. Polls that
+        disagree within the confirm window are taken as the PLC lagging
+        behind, after the window the state is re-read and reverted.
+        """
+        for attr, value in expected.items():
+            setattr(self, attr, value)
+        self._expected = expected
+        self._attr_available = True
+        self._async_publish()
+
+        if self._cancel_confirm:
+            self._cancel_confirm()
+        self._cancel_confirm = async_call_later(
+            self.hass, self._confirm_window, self._async_confirm_expired
+        )
+        self._async_boost()
+
+    @callback
+    def _async_confirm_expired(self, now: datetime) -> None:
+        self._cancel_confirm = None
+        if self._expected is not None:
+            self.hass.async_create_task(self._async_revert())
+
+    async def _async_revert(self) -> None:
+        expected, self._expected = self._expected, None
+        await self._async_readback()
+
+        if expected and any(getattr(self, a) != v for a, v in expected.items()):
+            _LOGGER.warning(
+                f"{self.name}: PLC did not confirm the commanded state within "
+                f"{self._confirm_window}, reverted"
+            )
+
+    @callback
+    def _async_apply_polled(self, state: dict[str, Any]) -> None:
+        """Publish a polled state, unless it contradicts a pending optimistic one."""
+        if (expected := self._expected) is not None:
+            if all(state.get(attr) == value for attr, value in expected.items()):
+                self._expected = None
+                if self._cancel_confirm:
+                    self._cancel_confirm()
+                    self._cancel_confirm = None
+            else:
+                state = {**state, **expected}
+
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        self._attr_available = True
+        self._async_publish()
+
+    async def _async_readback(self) -> None:
+        """Re-read the entity after a command, bypassing the read cache.
+
+        The PLC changes the polled addresses in response to a command, e.g.
+        the ison coil of a pulsed light, none of our writes drops them.
+        """
+        for call_type, addresses in (
+            (CALL_TYPE_COIL, self._coils),
+            (CALL_TYPE_REGISTER_HOLDING, self._registers),
+            (CALL_TYPE_DISCRETE, self._discrete_inputs),
+            (CALL_TYPE_REGISTER_INPUT, self._input_registers),
+        ):
+            for addr in addresses:
+                self._hub.invalidate(call_type, addr, 1)
+
+        await self.async_update()
+
+    @property
+    def _polled(self) -> bool:
+        """Whether the entity is polled by the coordinator."""
+        return bool(
+            self._coils or self._registers or self._discrete_inputs or self._input_registers
+        )
+
+    @callback
+    def _async_boost(self) -> None:
+        """Poll the entity at the fast interval until it settles again."""
+        if self._polled:
+            self._hub.coordinator.async_boost(self._handle_coordinator_update)
+
     @callback
     def async_run(self) -> None:
         """Remote start entity."""
         self.async_hold(update=False)
-        self._cancel_call = async_call_later(
-            self.hass, timedelta(milliseconds=100), self.async_update
-        )
-        if self._scan_interval > 0:
-            self._cancel_timer = async_track_time_interval(
-                self.hass, self.async_update, timedelta(
-                    seconds=self._scan_interval)
+        if self._polled:
+            self._cancel_timer = self._hub.coordinator.async_add_listener(
+                self._handle_coordinator_update,
+                self._coils,
+                self._registers,
+                self._scan_interval,
+                self._discrete_inputs,
+                self._input_registers,
+                self._adaptive,
             )
+        else:
+            self._cancel_call = async_call_later(
+                self.hass, timedelta(milliseconds=100), self.async_update
+            )
+            if self._scan_interval > 0:
+                self._cancel_timer = async_track_time_interval(
+                    self.hass, self.async_update, timedelta(
+                        seconds=self._scan_interval)
+                )
         self._attr_available = True
-        self.async_write_ha_state()
+        self._async_publish()
 
     @callback
     def async_hold(self, update: bool = True) -> None:
         """Remote stop entity."""
+        self._commands.async_cancel()
+        self._expected = None
+        if self._cancel_confirm:
+            self._cancel_confirm()
+            self._cancel_confirm = None
         if self._cancel_call:
             self._cancel_call()
             self._cancel_call = None
@@ -75,7 +232,7 @@ class BasePlatform(Entity):
             self._cancel_timer = None
         if update:
             self._attr_available = False
-            self.async_write_ha_state()
+            self._async_publish()
 
     async def async_base_added_to_hass(self) -> None:
         """Handle entity which will be added."""
@@ -0,0 +1,141 @@
+# Wago process image
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+
+from pymodbus.utilities import pack_bitstring
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+)
+
+from .codec import RegisterCodec
+from .plan import ReadPlan
+
+BIT_CALL_TYPES = (CALL_TYPE_COIL, CALL_TYPE_DISCRETE)
+
+
+class ProcessImage:
+    """Hub-owned mirror of the coils and registers covered by a read plan.
+
+    Coils and discrete inputs are packed eight per byte with every block
+    starting on a byte boundary, holding and input registers live in an
+    array('H'). Both are read through memoryviews, so a typed read does not
+    allocate. Addresses are looked up per call type.
+    """
+
+    def __init__(self, plan: ReadPlan) -> None:
+        self.plan = plan
+        self._offsets: list[int] = []
+        self._entries: dict[str, dict[int, tuple[int, int]]] = {}
+
+        bit_size = 0
+        register_size = 0
+        for index, block in enumerate(plan.blocks):
+            entries = self._entries.setdefault(block.call_type, {})
+            if block.call_type in BIT_CALL_TYPES:
+                self._offsets.append(bit_size)
+                for addr in range(block.start, block.end):
+                    entries[addr] = (index, bit_size + addr - block.start)
+                bit_size += (block.count + 7) // 8 * 8
+            else:
+                self._offsets.append(register_size)
+                for addr in range(block.start, block.end):
+                    entries[addr] = (index, register_size + addr - block.start)
+                register_size += block.count
+
+        self._bit_buffer = bytearray(bit_size // 8)
+        self._register_buffer = array("H", bytes(2 * register_size))
+        self._valid = bytearray(len(plan.blocks))
+
+        self._bits = memoryview(self._bit_buffer)
+        self._words = memoryview(self._register_buffer)
+
+    def write_bits(self, index: int, bits: Sequence[bool]) -> None:
+        block = self.plan.blocks[index]
+        if len(bits) < block.count:
+            self.invalidate(index)
+            return
+
+        offset = self._offsets[index] // 8
+        data = pack_bitstring(bits[: block.count])
+        self._bits[offset : offset + len(data)] = data
+        self._valid[index] = 1
+
+    def write_registers(self, index: int, registers: Sequence[int]) -> None:
+        block = self.plan.blocks[index]
+        if len(registers) < block.count:
+            # a short response would resize the exported buffer
+            self.invalidate(index)
+            return
+
+        offset = self._offsets[index]
+        self._register_buffer[offset : offset + block.count] = array(
+            "H", registers[: block.count]
+        )
+        self._valid[index] = 1
+
+    def invalidate(self, index: int) -> None:
+        self._valid[index] = 0
+
+    def get_bool(self, addr: int, call_type: str = CALL_TYPE_COIL) -> bool | None:
+        if (entry := self._entries.get(call_type, {}).get(addr)) is None:
+            return None
+
+        index, bit = entry
+        if not self._valid[index]:
+            return None
+
+        return bool(self._bits[bit >> 3] >> (bit & 7) & 1)
+
+    def get_u8(self, addr: int, call_type: str = CALL_TYPE_COIL) -> int | None:
+        """Return the byte made up of the coils addr..addr + 7, LSB first."""
+        entries = self._entries.get(call_type, {})
+        first = entries.get(addr)
+        last = entries.get(addr + 7)
+        if first is None or last is None or first[0] != last[0]:
+            return None
+
+        index, bit = first
+        if not self._valid[index]:
+            return None
+
+        byte, shift = bit >> 3, bit & 7
+        if shift == 0:
+            return self._bits[byte]
+
+        return (self._bits[byte] | self._bits[byte + 1] << 8) >> shift & 0xFF
+
+    def get_register(
+        self, addr: int, call_type: str = CALL_TYPE_REGISTER_HOLDING
+    ) -> int | None:
+        if (entry := self._entries.get(call_type, {}).get(addr)) is None:
+            return None
+
+        index, offset = entry
+        if not self._valid[index]:
+            return None
+
+        return self._words[offset]
+
+    def get_value(
+        self,
+        addr: int,
+        codec: RegisterCodec,
+        call_type: str = CALL_TYPE_REGISTER_HOLDING,
+    ) -> int | float | None:
+        """Decode the value in the registers addr..addr + codec.count - 1."""
+        entries = self._entries.get(call_type, {})
+        first = entries.get(addr)
+        last = entries.get(addr + codec.count - 1)
+        if first is None or last is None or first[0] != last[0]:
+            return None
+
+        index, offset = first
+        if not self._valid[index]:
+            return None
+
+        return codec.decode(self._words[offset : offset + codec.count])
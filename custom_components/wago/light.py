@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from typing import Any
 from datetime import datetime
-import asyncio
 import logging
 
 from homeassistant.components.light import (
@@ -12,7 +11,7 @@ from homeassistant.components.light import (
     brightness_supported,
 )
 from homeassistant.const import CONF_LIGHTS, CONF_NAME, STATE_ON, STATE_OFF
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
@@ -25,7 +24,9 @@ from .const import (
     CONF_ADDRESS_ISON,
     CONF_ADDRESS_VALSET,
     CONF_ADDRESS_BRIGHTNESS,
+    DATA_TYPE_U8,
 )
+from .codec import RegisterCodec, flag_register
 from .entity import BasePlatform
 from .wago import WagoHub
 
@@ -72,6 +73,17 @@ class WagoLight(BasePlatform, LightEntity, RestoreEntity):
 
         self._attr_is_on = False
 
+        self._coils = [self._address_ison]
+        self._brightness_register = None
+        if self._address_brightness is not None:
+            # read the brightness as a byte of its register where the coils are aliased
+            if (register := flag_register(self._address_brightness)) is not None:
+                self._brightness_register, shift = register
+                self._brightness_codec = RegisterCodec(DATA_TYPE_U8, shift=shift)
+                self._registers = [self._brightness_register]
+            else:
+                self._coils.extend(range(self._address_brightness, self._address_brightness + 8))
+
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await self.async_base_added_to_hass()
@@ -110,47 +122,17 @@ class WagoLight(BasePlatform, LightEntity, RestoreEntity):
             return False
 
         # Toggle Set
-        ret = await self._hub.async_write_bool(self._address_set, True)
-        if not ret:
-            return False
-
-        await asyncio.sleep(0.2)
-
-        ret = await self._hub.async_write_bool(self._address_set, False)
-        if not ret:
-            return False
-
-        return True
+        return await self._hub.async_pulse(self._address_set, self._pulse_width)
 
     async def _set_on(self) -> bool:
         _LOGGER.debug(f"Set ON")
         # Toggle Set
-        ret = await self._hub.async_write_bool(self._address_set, True)
-        if not ret:
-            return False
-
-        await asyncio.sleep(0.2)
-
-        ret = await self._hub.async_write_bool(self._address_set, False)
-        if not ret:
-            return False
-
-        return True
+        return await self._hub.async_pulse(self._address_set, self._pulse_width)
 
     async def _set_off(self) -> bool:
         _LOGGER.debug(f"Set OFF")
         # Toggle RST
-        ret = await self._hub.async_write_bool(self._address_rst, True)
-        if not ret:
-            return False
-
-        await asyncio.sleep(0.2)
-
-        ret = await self._hub.async_write_bool(self._address_rst, False)
-        if not ret:
-            return False
-
-        return True
+        return await self._hub.async_pulse(self._address_rst, self._pulse_width)
 
     async def _get_brightness(self) -> int | None:
         if not brightness_supported(self._attr_supported_color_modes):
@@ -182,21 +164,70 @@ class WagoLight(BasePlatform, LightEntity, RestoreEntity):
 
     async def async_turn_on(self, **kwargs: Any):
         """Set light on."""
+        await self._commands.async_call(lambda: self._async_turn_on(**kwargs))
+
+    async def _async_turn_on(self, **kwargs: Any):
         if self._attr_color_mode == ColorMode.BRIGHTNESS:
             brightness = kwargs.get(ATTR_BRIGHTNESS, self._attr_brightness)
             result = await self._set_brightness(brightness)
         else:
             result = await self._set_on()
 
+        if result and self._optimistic:
+            expected: dict[str, Any] = {"_attr_is_on": True}
+            if self._attr_color_mode == ColorMode.BRIGHTNESS:
+                expected["_attr_brightness"] = min(max(brightness, 0), 255)
+            self._async_optimistic(expected)
+            return
+
         self._attr_available = result is None
 
-        await self.async_update()
+        await self._async_readback()
+        self._async_boost()
 
     async def async_turn_off(self, **kwargs: Any):
+        await self._commands.async_call(self._async_turn_off)
+
+    async def _async_turn_off(self):
         result = await self._set_off()
+
+        if result and self._optimistic:
+            self._async_optimistic({"_attr_is_on": False})
+            return
+
         self._attr_available = result is None
 
-        await self.async_update()
+        await self._async_readback()
+        self._async_boost()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state from the coordinator's bulk read."""
+        coordinator = self._hub.coordinator
+
+        ison = coordinator.get_bool(self._address_ison)
+        if ison is None:
+            self._attr_available = False
+            self._async_publish()
+            return
+
+        state: dict[str, Any] = {"_attr_is_on": ison}
+
+        if brightness_supported(self._attr_supported_color_modes):
+            if self._brightness_register is not None:
+                brightness = coordinator.get_value(
+                    self._brightness_register, self._brightness_codec
+                )
+            else:
+                brightness = coordinator.get_u8(self._address_brightness)
+            if brightness is None:
+                self._attr_available = False
+                self._async_publish()
+                return
+
+            state["_attr_brightness"] = brightness
+
+        self._async_apply_polled(state)
 
     async def async_update(self, now: datetime | None = None) -> None:
         """Update the state of the cover."""
@@ -205,7 +236,7 @@ class WagoLight(BasePlatform, LightEntity, RestoreEntity):
         ison = await self._ison()
         if ison is None:
             self._attr_available = False
-            self.async_write_ha_state()
+            self._async_publish()
             return
 
         self._attr_is_on = ison
@@ -214,10 +245,10 @@ class WagoLight(BasePlatform, LightEntity, RestoreEntity):
             brightness = await self._get_brightness()
             if brightness is None:
                 self._attr_available = False
-                self.async_write_ha_state()
+                self._async_publish()
                 return
             
             self._attr_brightness = brightness
 
         self._attr_available = True
-        self.async_write_ha_state()
+        self._async_publish()
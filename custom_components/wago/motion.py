@@ -0,0 +1,136 @@
+# Wago cover motion monitor
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+
+from .const import MOTION_INTERVAL, PRIORITY_MOTION
+from .plan import ReadPlan, build_read_plan
+
+if TYPE_CHECKING:
+    from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class MotionTarget:
+    addr: int
+    update: Callable[[int], bool]
+    future: asyncio.Future[bool]
+    next_read: Callable[[], float] | None = None
+    due: float = 0
+
+
+class MotionMonitor:
+    """Track all moving covers of a hub with one block read per tick.
+
+    Every tick the position registers of all due in-flight targets are read
+    through a read plan and handed to the update callback of their target,
+    which returns True once the cover is within tolerance. A target is due
+    every MOTION_INTERVAL, or as often as its next_read callback asks for.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: WagoHub, max_gap: int = 0) -> None:
+        self._hass = hass
+        self._hub = hub
+        self._max_gap = max_gap
+        self._targets: list[MotionTarget] = []
+        self._plan = ReadPlan(max_gap=max_gap)
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Future[None] | None = None
+
+    async def async_track(
+        self,
+        addr: int,
+        update: Callable[[int], bool],
+        timeout: float,
+        next_read: Callable[[], float] | None = None,
+    ) -> bool:
+        """Wait until update accepts the value of the register at addr.
+
+        next_read returns the seconds until the target wants to be read again.
+        Returns False if a read fails, raises TimeoutError after timeout seconds.
+        """
+        target = MotionTarget(addr, update, self._hass.loop.create_future(), next_read)
+        self._targets.append(target)
+
+        if self._task is None or self._task.done():
+            self._task = self._hass.async_create_task(self._async_run())
+        elif self._wakeup is not None and not self._wakeup.done():
+            # read the new target right away
+            self._wakeup.set_result(None)
+
+        try:
+            async with asyncio.timeout(timeout):
+                return await target.future
+        finally:
+            if target in self._targets:
+                self._targets.remove(target)
+
+    async def _async_run(self) -> None:
+        loop = self._hass.loop
+        while self._targets:
+            now = loop.time()
+            due = [target for target in self._targets if target.due <= now]
+            registers = {target.addr for target in due}
+            if registers != self._plan.registers:
+                self._plan = build_read_plan((), registers, self._max_gap)
+
+            for block in self._plan.blocks:
+                targets = [target for target in due if target.addr in block]
+                try:
+                    values = await self._hub.async_read_registers(
+                        block.start, block.count, PRIORITY_MOTION
+                    )
+                    if values is not None and len(values) < block.count:
+                        values = None
+
+                    for target in targets:
+                        if target.future.done():
+                            continue
+
+                        if values is None:
+                            target.future.set_result(False)
+                        elif target.update(values[target.addr - block.start]):
+                            target.future.set_result(True)
+                except Exception as err:  # pylint: disable=broad-except
+                    # fail the covers of this block, the task serves the others
+                    _LOGGER.error(
+                        f"WagoHub {self._hub.name}: motion read at {block.start} failed: {err}"
+                    )
+                    for target in targets:
+                        if not target.future.done():
+                            target.future.set_result(False)
+
+            now = loop.time()
+            for target in due:
+                delay = target.next_read() if target.next_read else MOTION_INTERVAL
+                target.due = now + max(delay, MOTION_INTERVAL)
+
+            self._targets = [t for t in self._targets if not t.future.done()]
+            if self._targets:
+                self._wakeup = loop.create_future()
+                delay = min(target.due for target in self._targets) - now
+                try:
+                    async with asyncio.timeout(max(delay, 0)):
+                        await self._wakeup
+                except TimeoutError:
+                    pass
+                finally:
+                    self._wakeup = None
+
+    async def async_close(self) -> None:
+        for target in self._targets:
+            if not target.future.done():
+                target.future.set_result(False)
+        self._targets.clear()
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,107 @@
+# Wago pipelined Modbus TCP client
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from pymodbus.bit_read_message import ReadCoilsRequest, ReadDiscreteInputsRequest
+from pymodbus.bit_write_message import WriteMultipleCoilsRequest, WriteSingleCoilRequest
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ModbusException
+from pymodbus.pdu import ModbusRequest, ModbusResponse
+from pymodbus.register_read_message import (
+    ReadHoldingRegistersRequest,
+    ReadInputRegistersRequest,
+)
+from pymodbus.register_write_message import (
+    WriteMultipleRegistersRequest,
+    WriteSingleRegisterRequest,
+)
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+    CALL_TYPE_WRITE_COIL,
+    CALL_TYPE_WRITE_COILS,
+    CALL_TYPE_WRITE_REGISTER,
+    CALL_TYPE_WRITE_REGISTERS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUESTS: dict[str, type[ModbusRequest]] = {
+    CALL_TYPE_COIL: ReadCoilsRequest,
+    CALL_TYPE_DISCRETE: ReadDiscreteInputsRequest,
+    CALL_TYPE_REGISTER_HOLDING: ReadHoldingRegistersRequest,
+    CALL_TYPE_REGISTER_INPUT: ReadInputRegistersRequest,
+    CALL_TYPE_WRITE_COIL: WriteSingleCoilRequest,
+    CALL_TYPE_WRITE_COILS: WriteMultipleCoilsRequest,
+    CALL_TYPE_WRITE_REGISTER: WriteSingleRegisterRequest,
+    CALL_TYPE_WRITE_REGISTERS: WriteMultipleRegistersRequest,
+}
+
+
+class PipelinedClient:
+    """Modbus TCP client with several transactions in flight at once.
+
+    AsyncModbusTcpClient.async_execute holds a lock until the response of a
+    request arrived. Here requests are sent right away and their responses
+    are matched by transaction id, up to max_in_flight outstanding requests.
+    A request is not resent on timeout, it fails and marks the client
+    unhealthy until a request succeeds again.
+    """
+
+    def __init__(
+        self, host: str, port: int, max_in_flight: int, timeout: float = 3
+    ) -> None:
+        self._client = AsyncModbusTcpClient(host, port=port, timeout=timeout)
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.healthy = False
+
+    @property
+    def connected(self) -> bool:
+        return self._client.connected
+
+    async def async_connect(self) -> bool:
+        self.healthy = await self._client.connect()
+        return self.healthy
+
+    async def async_close(self) -> None:
+        self._client.close()
+
+    async def async_call(
+        self, addr: int, value: Any, call_type: str
+    ) -> ModbusResponse | None:
+        """Send one request, like ModbusHub.async_pb_call without the lock."""
+        request = REQUESTS[call_type](addr, value, slave=0)
+
+        self.in_flight += 1
+        try:
+            async with self._slots:
+                client = self._client
+                tid = request.transaction_id = client.transaction.getNextTID()
+                response = client.build_response(tid)
+                try:
+                    client.send(client.framer.buildPacket(request))
+                    async with asyncio.timeout(self._timeout):
+                        result = await response
+                except TimeoutError:
+                    client.transaction.delTransaction(tid)
+                    _LOGGER.debug(f"Pipelined {call_type} at {addr}: no response")
+                except ModbusException as err:
+                    client.transaction.delTransaction(tid)
+                    _LOGGER.debug(f"Pipelined {call_type} at {addr}: {err}")
+                else:
+                    self.healthy = True
+                    return result
+        finally:
+            self.in_flight -= 1
+
+        self.healthy = False
+        return None
@@ -0,0 +1,159 @@
+# Wago read plan
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+)
+
+from .const import MAX_READ_COILS, MAX_READ_REGISTERS
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """One read request covering the addresses start..start + count - 1."""
+
+    call_type: str
+    start: int
+    count: int
+
+    @property
+    def end(self) -> int:
+        return self.start + self.count
+
+    def __contains__(self, addr: int) -> bool:
+        return self.start <= addr < self.end
+
+
+@dataclass(frozen=True)
+class ReadPlan:
+    """Block reads covering every address polled on a hub."""
+
+    coils: frozenset[int] = frozenset()
+    registers: frozenset[int] = frozenset()
+    max_gap: int = 0
+    blocks: tuple[ReadBlock, ...] = ()
+    discrete_inputs: frozenset[int] = frozenset()
+    input_registers: frozenset[int] = frozenset()
+    values: frozenset[tuple[str, int, int]] = frozenset()
+
+    @property
+    def frames(self) -> int:
+        return len(self.blocks)
+
+    def blocks_for(
+        self,
+        coils: Iterable[int],
+        registers: Iterable[int],
+        discrete_inputs: Iterable[int] = (),
+        input_registers: Iterable[int] = (),
+    ) -> tuple[int, ...]:
+        """Return the indices of the blocks covering the given addresses."""
+        addresses = [(CALL_TYPE_COIL, addr) for addr in coils]
+        addresses += [(CALL_TYPE_REGISTER_HOLDING, addr) for addr in registers]
+        addresses += [(CALL_TYPE_DISCRETE, addr) for addr in discrete_inputs]
+        addresses += [(CALL_TYPE_REGISTER_INPUT, addr) for addr in input_registers]
+
+        return tuple(
+            index
+            for index, block in enumerate(self.blocks)
+            if any(t == block.call_type and a in block for t, a in addresses)
+        )
+
+
+def merge_ranges(
+    addresses: Iterable[int],
+    max_gap: int,
+    max_count: int,
+    values: Iterable[tuple[int, int]] = (),
+) -> list[tuple[int, int]]:
+    """Merge addresses into (start, count) ranges.
+
+    Neighbouring addresses at most max_gap apart share a range, as long as the
+    range stays within max_count addresses. The addresses of a (start, count)
+    range in values, like the registers of a 32 bit value, are never split:
+    a range is closed before a value that would not fit.
+    """
+    values = set(values)
+    covered = {addr for start, count in values for addr in range(start, start + count)}
+    spans: list[tuple[int, int]] = []
+    for start, count in sorted(
+        values | {(addr, 1) for addr in addresses if addr not in covered}
+    ):
+        if spans and start < spans[-1][0] + spans[-1][1]:
+            first, length = spans[-1]
+            spans[-1] = (first, max(first + length, start + count) - first)
+        else:
+            spans.append((start, count))
+
+    ranges: list[tuple[int, int]] = []
+
+    for addr, count in spans:
+        end = addr + count
+        if ranges:
+            start, length = ranges[-1]
+            if addr - (start + length) <= max_gap and end - start <= max_count:
+                ranges[-1] = (start, end - start)
+                continue
+
+        ranges.append((addr, count))
+
+    return ranges
+
+
+def value_ranges(addresses: Iterable[int], max_count: int) -> list[tuple[int, int]]:
+    """Return the runs of neighbouring addresses of one entity, e.g. its values."""
+    return [
+        (start, count)
+        for start, count in merge_ranges(addresses, 0, max_count)
+        if count > 1
+    ]
+
+
+def build_read_plan(
+    coils: Iterable[int],
+    registers: Iterable[int],
+    max_gap: int = 0,
+    discrete_inputs: Iterable[int] = (),
+    input_registers: Iterable[int] = (),
+    values: Iterable[tuple[str, int, int]] = (),
+) -> ReadPlan:
+    """Plan the block reads, values are (call_type, start, count) kept whole.
+
+    max_gap counts registers. Coils and discrete inputs cost a bit on the
+    wire instead of a word, their gaps may be 16 times as long for the same
+    bytes, so the one flag word per entity of the WAGO layout still merges.
+    """
+    coils = frozenset(coils)
+    registers = frozenset(registers)
+    discrete_inputs = frozenset(discrete_inputs)
+    input_registers = frozenset(input_registers)
+    values = frozenset(values)
+
+    blocks: list[ReadBlock] = []
+    for call_type, addresses, gap, max_count in (
+        (CALL_TYPE_COIL, coils, 16 * max_gap, MAX_READ_COILS),
+        (CALL_TYPE_DISCRETE, discrete_inputs, 16 * max_gap, MAX_READ_COILS),
+        (CALL_TYPE_REGISTER_HOLDING, registers, max_gap, MAX_READ_REGISTERS),
+        (CALL_TYPE_REGISTER_INPUT, input_registers, max_gap, MAX_READ_REGISTERS),
+    ):
+        spans = [(start, count) for t, start, count in values if t == call_type]
+        blocks.extend(
+            ReadBlock(call_type, start, count)
+            for start, count in merge_ranges(addresses, gap, max_count, spans)
+        )
+
+    return ReadPlan(
+        coils,
+        registers,
+        max_gap,
+        tuple(blocks),
+        discrete_inputs,
+        input_registers,
+        values,
+    )
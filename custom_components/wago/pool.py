@@ -0,0 +1,124 @@
+# Wago Modbus TCP connection pool
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from pymodbus.pdu import ModbusResponse
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_WRITE_COIL,
+    CALL_TYPE_WRITE_COILS,
+    CALL_TYPE_WRITE_REGISTER,
+    CALL_TYPE_WRITE_REGISTERS,
+)
+from homeassistant.core import HomeAssistant
+
+from .const import POOL_HEALTH_INTERVAL
+from .pipeline import PipelinedClient
+
+_LOGGER = logging.getLogger(__name__)
+
+WRITE_CALL_TYPES = (
+    CALL_TYPE_WRITE_COIL,
+    CALL_TYPE_WRITE_COILS,
+    CALL_TYPE_WRITE_REGISTER,
+    CALL_TYPE_WRITE_REGISTERS,
+)
+
+
+class ConnectionPool:
+    """Spread the requests of a hub over several TCP sessions to one controller.
+
+    Reads go to the healthy session with the fewest requests in flight.
+    All writes go to the first healthy session, so they reach the controller
+    in order, even when merged frames of the write queue start at different
+    addresses or coils and registers alias the same flag word. Every
+    POOL_HEALTH_INTERVAL seconds lost sessions are reconnected and unhealthy
+    ones probed with a read of probe_target before they take requests again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        host: str,
+        port: int,
+        size: int,
+        max_in_flight: int,
+        timeout: float,
+        probe_target: Callable[[], tuple[str, int]],
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._probe_target = probe_target
+        self.sessions = [
+            PipelinedClient(host, port, max_in_flight, timeout) for _ in range(size)
+        ]
+        self._task: asyncio.Task | None = None
+
+    @property
+    def concurrency(self) -> int:
+        return sum(session.max_in_flight for session in self.sessions)
+
+    async def async_connect(self) -> bool:
+        """Connect all sessions, True if at least one is up."""
+        await asyncio.gather(*(session.async_connect() for session in self.sessions))
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_run(), f"wago {self._name} connection pool"
+            )
+        return any(session.healthy for session in self.sessions)
+
+    def _pick(self, addr: int, call_type: str) -> PipelinedClient | None:
+        if call_type in WRITE_CALL_TYPES:
+            return next((session for session in self.sessions if session.healthy), None)
+
+        return min(
+            (session for session in self.sessions if session.healthy),
+            key=lambda session: session.in_flight,
+            default=None,
+        )
+
+    async def async_call(
+        self, addr: int, value: Any, call_type: str
+    ) -> ModbusResponse | None:
+        if (session := self._pick(addr, call_type)) is None:
+            return None
+
+        return await session.async_call(addr, value, call_type)
+
+    async def async_check(self) -> bool:
+        """Reconnect and probe the unhealthy sessions, True if one is healthy."""
+        call_type, addr = self._probe_target()
+
+        async def check(session: PipelinedClient) -> None:
+            if session.healthy:
+                return
+            if not session.connected and not await session.async_connect():
+                return
+            await session.async_call(addr, 1, call_type)
+
+        await asyncio.gather(*(check(session) for session in self.sessions))
+
+        healthy = sum(session.healthy for session in self.sessions)
+        if healthy < len(self.sessions):
+            _LOGGER.debug(
+                f"WagoHub {self._name}: {healthy} of {len(self.sessions)} sessions healthy"
+            )
+        return healthy > 0
+
+    async def _async_run(self) -> None:
+        while True:
+            await asyncio.sleep(POOL_HEALTH_INTERVAL)
+            await self.async_check()
+
+    async def async_close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for session in self.sessions:
+            await session.async_close()
@@ -0,0 +1,141 @@
+# Wago pulse engine
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MAX_WRITE_COILS, PULSE_TICK
+from .plan import merge_ranges
+
+if TYPE_CHECKING:
+    from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PulseEngine:
+    """Set/reset pulses of all entities of a hub.
+
+    Rising edges requested within one tick are written together, one
+    write_coils frame per contiguous run of coils. Falling edges that are due
+    within the same tick are written together as well.
+    """
+
+    def __init__(self, hass: HomeAssistant, hub: WagoHub) -> None:
+        self._hass = hass
+        self._hub = hub
+        self._pending: list[tuple[int, float, asyncio.Future[bool]]] = []
+        self._high: set[int] = set()
+        self._falling: dict[int, list[tuple[int, asyncio.Future[bool]]]] = {}
+        self._falling_handles: dict[int, asyncio.TimerHandle] = {}
+        self._rising_handle: asyncio.TimerHandle | None = None
+
+    async def async_pulse(self, addr: int, width: float) -> bool:
+        """Pulse a coil high for width seconds, return once it is low again."""
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._pending.append((addr, width, future))
+        self._schedule_rising()
+
+        return await future
+
+    @callback
+    def _schedule_rising(self) -> None:
+        if self._rising_handle is None and self._pending:
+            self._rising_handle = self._hass.loop.call_later(
+                PULSE_TICK, self._flush_rising
+            )
+
+    @callback
+    def _flush_rising(self) -> None:
+        self._rising_handle = None
+
+        # a coil that is still high has to fall before it can rise again
+        pulses: dict[int, tuple[float, asyncio.Future[bool]]] = {}
+        deferred = []
+        for addr, width, future in self._pending:
+            if addr in self._high or addr in pulses:
+                deferred.append((addr, width, future))
+            else:
+                pulses[addr] = (width, future)
+        self._pending = deferred
+
+        if pulses:
+            self._high.update(pulses)
+            self._hass.async_create_task(self._async_rising(pulses))
+
+    async def _async_rising(
+        self, pulses: dict[int, tuple[float, asyncio.Future[bool]]]
+    ) -> None:
+        failed = await self._async_write(pulses, True)
+
+        loop = self._hass.loop
+        for addr, (width, future) in pulses.items():
+            if addr in failed:
+                self._release(addr, future, False)
+                continue
+
+            # group falling edges on the tick they are due in
+            due = int((loop.time() + width) / PULSE_TICK) + 1
+            if due not in self._falling:
+                self._falling[due] = []
+                self._falling_handles[due] = loop.call_at(
+                    due * PULSE_TICK, self._flush_falling, due
+                )
+            self._falling[due].append((addr, future))
+
+    @callback
+    def _flush_falling(self, due: int) -> None:
+        self._falling_handles.pop(due, None)
+        if pulses := self._falling.pop(due, None):
+            self._hass.async_create_task(self._async_falling(pulses))
+
+    async def _async_falling(self, pulses: list[tuple[int, asyncio.Future[bool]]]) -> None:
+        failed = await self._async_write((addr for addr, _ in pulses), False)
+
+        for addr, future in pulses:
+            self._release(addr, future, addr not in failed)
+
+        self._schedule_rising()
+
+    async def _async_write(self, addresses: Iterable[int], value: bool) -> set[int]:
+        """Write value to all addresses, return the addresses that failed."""
+        runs = merge_ranges(addresses, 0, MAX_WRITE_COILS)
+        results = await asyncio.gather(
+            *(self._hub.async_write_coils(start, [value] * count) for start, count in runs)
+        )
+
+        failed: set[int] = set()
+        for (start, count), ok in zip(runs, results):
+            if not ok:
+                failed.update(range(start, start + count))
+
+        return failed
+
+    @callback
+    def _release(self, addr: int, future: asyncio.Future[bool], result: bool) -> None:
+        self._high.discard(addr)
+        if not future.done():
+            future.set_result(result)
+
+    async def async_close(self) -> None:
+        """Drop pending pulses and pull every coil that is still high low."""
+        if self._rising_handle:
+            self._rising_handle.cancel()
+            self._rising_handle = None
+        for handle in self._falling_handles.values():
+            handle.cancel()
+        self._falling_handles.clear()
+
+        for _, _, future in self._pending:
+            if not future.done():
+                future.set_result(False)
+        self._pending.clear()
+
+        pulses = [pulse for pulses in self._falling.values() for pulse in pulses]
+        self._falling.clear()
+        if pulses:
+            await self._async_falling(pulses)
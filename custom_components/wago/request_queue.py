@@ -0,0 +1,176 @@
+# Wago request priority queue
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import PRIORITY_COMMAND, PRIORITY_MOTION, PRIORITY_POLL
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITIES = (PRIORITY_COMMAND, PRIORITY_MOTION, PRIORITY_POLL)
+
+
+@dataclass(eq=False)
+class QueuedRequest:
+    key: Hashable | None
+    call: Callable[[], Awaitable[Any]]
+    future: asyncio.Future[Any]
+    enqueued: float
+
+
+@dataclass
+class QueueStats:
+    requests: int = 0
+    merged: int = 0
+    dropped: int = 0
+    wait_total: float = 0
+    wait_max: float = 0
+
+    @property
+    def wait_avg(self) -> float:
+        return self.wait_total / self.requests if self.requests else 0
+
+
+class RequestQueue:
+    """Run the requests of a hub one after another, highest priority first.
+
+    Commands go before motion tracking, which goes before background polling.
+    Every class holds at most depth requests. A read that is already queued
+    is shared instead of queued twice. When the poll class is full its oldest
+    request is dropped, other classes refuse new requests. Up to concurrency
+    requests run at once, for clients that pipeline them.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, name: str, depth: int, concurrency: int = 1
+    ) -> None:
+        self._hass = hass
+        self._name = name
+        self._depth = depth
+        self.concurrency = concurrency
+        self._queues: dict[int, deque[QueuedRequest]] = {p: deque() for p in PRIORITIES}
+        self._wakeup = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._running: set[QueuedRequest] = set()
+        self.stats: dict[int, QueueStats] = {p: QueueStats() for p in PRIORITIES}
+
+    @property
+    def size(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def async_submit(
+        self,
+        priority: int,
+        key: Hashable | None,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Queue call and return its result, None if it was dropped."""
+        if key is not None and (request := self._find(key)) is not None:
+            self.stats[priority].merged += 1
+            self.promote(key, priority)
+            return await asyncio.shield(request.future)
+
+        queue = self._queues[priority]
+        if len(queue) >= self._depth:
+            if priority != PRIORITY_POLL:
+                _LOGGER.error(f"WagoHub {self._name}: request queue {priority} is full")
+                return None
+
+            stale = queue.popleft()
+            self.stats[priority].dropped += 1
+            if not stale.future.done():
+                stale.future.set_result(None)
+
+        request = QueuedRequest(
+            key, call, self._hass.loop.create_future(), self._hass.loop.time()
+        )
+        queue.append(request)
+        self._wakeup.set()
+
+        self._tasks = {task for task in self._tasks if not task.done()}
+        if len(self._tasks) < self.concurrency:
+            self._tasks.add(
+                self._hass.async_create_background_task(
+                    self._async_run(), f"wago {self._name} request queue"
+                )
+            )
+
+        return await asyncio.shield(request.future)
+
+    def _find(self, key: Hashable) -> QueuedRequest | None:
+        for queue in self._queues.values():
+            for request in queue:
+                if request.key == key:
+                    return request
+        return None
+
+    @callback
+    def promote(self, key: Hashable, priority: int) -> None:
+        """Move a queued request up to priority."""
+        for current in PRIORITIES:
+            if current <= priority:
+                continue
+            for request in self._queues[current]:
+                if request.key == key:
+                    self._queues[current].remove(request)
+                    self._queues[priority].append(request)
+                    return
+
+    def _next(self) -> tuple[int, QueuedRequest] | None:
+        for priority in PRIORITIES:
+            if self._queues[priority]:
+                return priority, self._queues[priority].popleft()
+        return None
+
+    async def _async_run(self) -> None:
+        while True:
+            if (item := self._next()) is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            priority, request = item
+            wait = self._hass.loop.time() - request.enqueued
+            stats = self.stats[priority]
+            stats.requests += 1
+            stats.wait_total += wait
+            stats.wait_max = max(stats.wait_max, wait)
+            if wait > 1:
+                _LOGGER.debug(
+                    f"WagoHub {self._name}: request waited {wait:.2f}s in queue {priority}"
+                )
+
+            self._running.add(request)
+            try:
+                result = await request.call()
+            except Exception as err:  # pylint: disable=broad-except
+                if not request.future.done():
+                    request.future.set_exception(err)
+                continue
+            finally:
+                self._running.discard(request)
+
+            if not request.future.done():
+                request.future.set_result(result)
+
+    async def async_close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+        requests = [request for queue in self._queues.values() for request in queue]
+        requests.extend(self._running)
+        self._running.clear()
+
+        for queue in self._queues.values():
+            queue.clear()
+        for request in requests:
+            if not request.future.done():
+                request.future.set_result(None)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.components.modbus.const import CALL_TYPE_REGISTER_INPUT
+from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_NAME,
+    CONF_SENSORS,
+    CONF_UNIT_OF_MEASUREMENT,
+    UnitOfDataSize,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+from . import get_hub
+from .codec import RegisterCodec
+from .const import (
+    CONF_INPUT_TYPE,
+    CONF_DATA_TYPE,
+    CONF_BYTE_ORDER,
+    CONF_WORD_ORDER,
+    CONF_SCALE,
+    CONF_OFFSET,
+    CONF_PRECISION,
+    CONF_STATE_CLASS,
+    PRIORITY_POLL,
+)
+from .entity import BasePlatform
+from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+# diagnostic sensors only read counters of the hub, they never touch the bus
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class WagoDiagnosticDescription(SensorEntityDescription):
+    value_fn: Callable[[WagoHub], Any]
+
+
+DIAGNOSTIC_SENSORS = (
+    WagoDiagnosticDescription(
+        key="requests",
+        name="Requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hub: hub.stats.requests,
+    ),
+    WagoDiagnosticDescription(
+        key="errors",
+        name="Errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hub: hub.stats.errors,
+    ),
+    WagoDiagnosticDescription(
+        key="bytes",
+        name="Bytes",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfDataSize.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda hub: hub.stats.bytes,
+    ),
+    WagoDiagnosticDescription(
+        key="latency",
+        name="Latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda hub: hub.stats.latency_avg * 1000,
+    ),
+    WagoDiagnosticDescription(
+        key="poll_cycle",
+        name="Poll cycle",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda hub: hub.stats.cycles.last * 1000,
+    ),
+    WagoDiagnosticDescription(
+        key="queue_size",
+        name="Queue size",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda hub: hub.queue.size,
+    ),
+    WagoDiagnosticDescription(
+        key="queue_wait",
+        name="Poll queue wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda hub: hub.queue.stats[PRIORITY_POLL].wait_avg * 1000,
+    ),
+)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Read configuration and create Modbus sensors and the diagnostic sensors of a hub."""
+    if discovery_info is None:
+        return
+
+    hub: WagoHub = get_hub(hass, discovery_info[CONF_NAME])
+    sensors: list[SensorEntity] = [
+        WagoSensor(hass, hub, entry) for entry in discovery_info.get(CONF_SENSORS, [])
+    ]
+    sensors.extend(
+        WagoDiagnosticSensor(hub, description) for description in DIAGNOSTIC_SENSORS
+    )
+    async_add_entities(sensors)
+
+
+class WagoSensor(BasePlatform, SensorEntity):
+    def __init__(
+        self, hass: HomeAssistant, hub: WagoHub, config: dict[str, Any]
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(hass, hub, config)
+
+        self._address = int(config[CONF_ADDRESS])
+        self._input_type = config[CONF_INPUT_TYPE]
+        self._codec = RegisterCodec(
+            config[CONF_DATA_TYPE], config[CONF_BYTE_ORDER], config[CONF_WORD_ORDER]
+        )
+        self._scale: float = config[CONF_SCALE]
+        self._offset: float = config[CONF_OFFSET]
+        self._precision: int | None = config.get(CONF_PRECISION)
+
+        self._attr_native_unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT)
+        self._attr_state_class = config.get(CONF_STATE_CLASS)
+
+        # polled with the shared block reads, scan_interval bounds the age
+        self._adaptive = False
+        addresses = list(range(self._address, self._address + self._codec.count))
+        if self._input_type == CALL_TYPE_REGISTER_INPUT:
+            self._input_registers = addresses
+        else:
+            self._registers = addresses
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await self.async_base_added_to_hass()
+
+    def _set_value(self, value: int | float | None) -> None:
+        self._attr_available = value is not None
+        if value is None:
+            return
+
+        value = value * self._scale + self._offset
+        if self._precision is not None:
+            value = round(value, self._precision) if self._precision else round(value)
+        self._attr_native_value = value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state from the coordinator's bulk read."""
+        self._set_value(
+            self._hub.coordinator.get_value(self._address, self._codec, self._input_type)
+        )
+        self._async_publish()
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Update the state of the sensor."""
+        # remark "now" is a dummy parameter to avoid problems with
+        # async_track_time_interval
+        self._set_value(
+            await self._hub.async_read_value(self._address, self._codec, self._input_type)
+        )
+        self._async_publish()
+
+
+class WagoDiagnosticSensor(SensorEntity):
+    """Request statistics of a hub."""
+
+    entity_description: WagoDiagnosticDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = True
+
+    def __init__(self, hub: WagoHub, description: WagoDiagnosticDescription) -> None:
+        self._hub = hub
+        self.entity_description = description
+        self._attr_name = f"{hub.name} {description.name}"
+        self._attr_unique_id = f"{hub.name}_{description.key}"
+
+    async def async_update(self) -> None:
+        self._attr_native_value = self.entity_description.value_fn(self._hub)
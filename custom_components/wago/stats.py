@@ -0,0 +1,142 @@
+# Wago hub statistics
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any
+
+from homeassistant.components.modbus.const import (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+    CALL_TYPE_WRITE_COILS,
+    CALL_TYPE_WRITE_REGISTERS,
+)
+
+# histogram bucket bounds in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+# Modbus TCP header and fixed request / response sizes in bytes
+MBAP = 7
+
+
+def frame_bytes(call_type: str, value: Any) -> int:
+    """Estimate the bytes of request and response of one call on the wire."""
+    if call_type in (CALL_TYPE_COIL, CALL_TYPE_DISCRETE):
+        return MBAP + 5 + MBAP + 2 + (value + 7) // 8
+    if call_type in (CALL_TYPE_REGISTER_HOLDING, CALL_TYPE_REGISTER_INPUT):
+        return MBAP + 5 + MBAP + 2 + 2 * value
+    if call_type == CALL_TYPE_WRITE_COILS:
+        return MBAP + 6 + (len(value) + 7) // 8 + MBAP + 5
+    if call_type == CALL_TYPE_WRITE_REGISTERS:
+        return MBAP + 6 + 2 * len(value) + MBAP + 5
+    return MBAP + 5 + MBAP + 5
+
+
+class Histogram:
+    """Fixed bucket histogram."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.last = value
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile."""
+        if not self.count:
+            return 0
+
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": self.avg,
+            "max": self.max,
+            "last": self.last,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(self.bounds, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+
+@dataclass
+class CallStats:
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    latency: Histogram = field(default_factory=Histogram)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class HubStats:
+    """Request counters, latency histograms and poll cycle durations of a hub."""
+
+    def __init__(self) -> None:
+        self.calls: dict[str, CallStats] = {}
+        self.cycles = Histogram()
+
+    def record_call(self, call_type: str, value: Any, latency: float, ok: bool) -> None:
+        stats = self.calls.setdefault(call_type, CallStats())
+        stats.requests += 1
+        stats.errors += not ok
+        stats.bytes += frame_bytes(call_type, value)
+        stats.latency.record(latency)
+
+    def record_cycle(self, duration: float) -> None:
+        self.cycles.record(duration)
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.requests for stats in self.calls.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(stats.errors for stats in self.calls.values())
+
+    @property
+    def bytes(self) -> int:
+        return sum(stats.bytes for stats in self.calls.values())
+
+    @property
+    def latency_avg(self) -> float:
+        count = sum(stats.latency.count for stats in self.calls.values())
+        total = sum(stats.latency.total for stats in self.calls.values())
+        return total / count if count else 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": {call_type: stats.as_dict() for call_type, stats in self.calls.items()},
+            "poll_cycles": self.cycles.as_dict(),
+        }
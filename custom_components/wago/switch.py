@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.const import (
+    CONF_ADDRESS,
+    CONF_NAME,
+    CONF_SWITCHES,
+    STATE_OFF,
+    STATE_ON,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
+
+from . import get_hub
+from .const import (
+    CONF_ADDRESS_SET,
+    CONF_ADDRESS_RST,
+    CONF_ADDRESS_ISON,
+)
+from .entity import BasePlatform
+from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_platform(
+    hass: HomeAssistant,
+    config: ConfigType,
+    async_add_entities: AddEntitiesCallback,
+    discovery_info: DiscoveryInfoType | None = None,
+) -> None:
+    """Read configuration and create Modbus switches."""
+    if discovery_info is None:
+        return
+
+    switches = []
+    for entry in discovery_info[CONF_SWITCHES]:
+        hub: WagoHub = get_hub(hass, discovery_info[CONF_NAME])
+        switches.append(WagoSwitch(hass, hub, entry))
+    async_add_entities(switches)
+
+
+class WagoSwitch(BasePlatform, SwitchEntity, RestoreEntity):
+    """A plain coil or a set/rst pulse pair with an optional ison coil.
+
+    Commands go through the hub's write queue and pulse engine, so switches
+    toggled together end up in one write_coils frame per contiguous range.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, hub: WagoHub, config: dict[str, Any]
+    ) -> None:
+        """Initialize the switch."""
+        super().__init__(hass, hub, config)
+
+        self._address = config.get(CONF_ADDRESS)
+        self._address_set = config.get(CONF_ADDRESS_SET)
+        self._address_rst = config.get(CONF_ADDRESS_RST)
+
+        # the state of a pulse pair is read back from its ison coil, if any
+        self._address_ison = config.get(CONF_ADDRESS_ISON, self._address)
+
+        self._attr_is_on = False
+        self._attr_assumed_state = self._address_ison is None
+
+        if self._address_ison is not None:
+            self._coils = [self._address_ison]
+
+    async def async_added_to_hass(self) -> None:
+        """Handle entity which will be added."""
+        await self.async_base_added_to_hass()
+        if state := await self.async_get_last_state():
+            if state.state == STATE_ON:
+                self._attr_is_on = True
+            elif state.state == STATE_OFF:
+                self._attr_is_on = False
+
+    async def _set(self, value: bool) -> bool:
+        _LOGGER.debug(f"Set {'ON' if value else 'OFF'}")
+
+        if self._address is not None:
+            return await self._hub.async_write_coils(self._address, [value])
+
+        # Toggle Set / RST
+        addr = self._address_set if value else self._address_rst
+        return await self._hub.async_pulse(addr, self._pulse_width)
+
+    async def _async_command(self, value: bool) -> None:
+        if not await self._set(value):
+            self._attr_available = False
+            self._async_publish()
+            return
+
+        if self._attr_assumed_state:
+            self._attr_is_on = value
+            self._attr_available = True
+            self._async_publish()
+            return
+
+        if self._optimistic:
+            self._async_optimistic({"_attr_is_on": value})
+            return
+
+        await self._async_readback()
+        self._async_boost()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Set switch on."""
+        await self._async_command(True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Set switch off."""
+        await self._async_command(False)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update the state from the coordinator's bulk read."""
+        state = self._hub.coordinator.get_bool(self._address_ison)
+        if state is None:
+            self._attr_available = False
+            self._async_publish()
+            return
+
+        self._async_apply_polled({"_attr_is_on": state})
+
+    async def async_update(self, now: datetime | None = None) -> None:
+        """Update the state of the switch."""
+        # remark "now" is a dummy parameter to avoid problems with
+        # async_track_time_interval
+        if self._address_ison is None:
+            self._async_publish()
+            return
+
+        state = await self._hub.async_read_bool(self._address_ison)
+
+        self._attr_available = state is not None
+        if state is not None:
+            self._attr_is_on = state
+        self._async_publish()
@@ -0,0 +1,111 @@
+# Wago cover travel model
+from __future__ import annotations
+
+from .const import MOTION_CONFIRM_INTERVAL, MOTION_INTERVAL
+
+# weight of a new observation in the learned speeds
+LEARN_RATE = 0.5
+# minimum change in percent before an observation is used for learning
+LEARN_MIN_DELTA = 5
+
+
+class TravelModel:
+    """Constant speed model of the position and tilt of a cover.
+
+    Speeds are in percent per second, configured from the full travel and
+    tilt times or learned from the confirmation reads of earlier moves. Each
+    confirmation read re-anchors the prediction, so errors do not add up.
+    """
+
+    def __init__(
+        self, travel_time: float | None = None, tilt_time: float | None = None
+    ) -> None:
+        self.pos_speed = 100 / travel_time if travel_time else None
+        self.ang_speed = 100 / tilt_time if tilt_time else None
+        self._learn_pos = travel_time is None
+        self._learn_ang = tilt_time is None
+        self._start = 0.0
+        self._origin: tuple[float, float] = (0, 0)
+        self._target: tuple[int, int] = (0, 0)
+        self._anchor: tuple[float, tuple[float, float]] | None = None
+
+    def start(self, now: float, origin: tuple[float, float], target: tuple[int, int]) -> None:
+        self._start = now
+        self._origin = origin
+        self._target = target
+        self._anchor = (now, origin)
+
+    @staticmethod
+    def _approach(value: float, target: int, speed: float | None, elapsed: float) -> float:
+        if speed is None:
+            return value
+        step = speed * elapsed
+        if abs(target - value) <= step:
+            return target
+        return value + step if target > value else value - step
+
+    def predict(self, now: float) -> tuple[float, float]:
+        """Return the expected position and tilt at now."""
+        if self._anchor is None:
+            return self._origin
+
+        time, (pos, ang) = self._anchor
+        elapsed = now - time
+        return (
+            self._approach(pos, self._target[0], self.pos_speed, elapsed),
+            self._approach(ang, self._target[1], self.ang_speed, elapsed),
+        )
+
+    def eta(self, now: float) -> float | None:
+        """Seconds until the cover is expected at its target, None if unknown."""
+        pos, ang = self.predict(now)
+        remaining = []
+        for value, target, speed in (
+            (pos, self._target[0], self.pos_speed),
+            (ang, self._target[1], self.ang_speed),
+        ):
+            if value == target:
+                continue
+            if speed is None:
+                return None
+            remaining.append(abs(target - value) / speed)
+
+        return max(remaining, default=0)
+
+    def next_read(self, now: float) -> float:
+        """Seconds until the next confirmation read.
+
+        Reads are spread out while the cover is far from its target and get
+        denser towards the predicted arrival, halving the remaining time.
+        """
+        if (eta := self.eta(now)) is None:
+            return MOTION_INTERVAL
+
+        return min(max(eta / 2, MOTION_INTERVAL), MOTION_CONFIRM_INTERVAL)
+
+    def observe(self, now: float, position: tuple[float, float]) -> None:
+        """Learn from a confirmation read and re-anchor the prediction on it."""
+        if self._anchor is None:
+            return
+
+        elapsed = now - self._start
+        if elapsed > 0:
+            pos_delta = abs(position[0] - self._origin[0])
+            ang_delta = abs(position[1] - self._origin[1])
+            # only while the axis is still on its way, a finished axis would
+            # make the cover look slower than it is
+            if self._learn_pos and pos_delta >= LEARN_MIN_DELTA and position[0] != self._target[0]:
+                self.pos_speed = self._learn(self.pos_speed, pos_delta / elapsed)
+            if self._learn_ang and ang_delta >= LEARN_MIN_DELTA and position[1] != self._target[1]:
+                self.ang_speed = self._learn(self.ang_speed, ang_delta / elapsed)
+
+        self._anchor = (now, position)
+
+    @staticmethod
+    def _learn(speed: float | None, observed: float) -> float:
+        if speed is None:
+            return observed
+        return speed + LEARN_RATE * (observed - speed)
+
+    def stop(self) -> None:
+        self._anchor = None
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+from datetime import timedelta
 
 import logging
 from typing import Any
@@ -13,31 +14,84 @@ from pymodbus.client import (
 )
 from pymodbus.utilities import pack_bitstring, unpack_bitstring
 from pymodbus.exceptions import ModbusException
+from pymodbus.framer import ModbusSocketFramer
 
 import struct
+import time
 
-from homeassistant.const import CONF_NAME, EVENT_HOMEASSISTANT_STOP
+from homeassistant.const import CONF_NAME, EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.components.modbus.const import (
     MODBUS_DOMAIN,
     CALL_TYPE_WRITE_COILS,
-    CALL_TYPE_WRITE_COIL,
     CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
     CALL_TYPE_REGISTER_HOLDING,
-    CALL_TYPE_WRITE_REGISTER,
+    CALL_TYPE_REGISTER_INPUT,
+    CALL_TYPE_WRITE_REGISTERS,
 )
 
 
-from homeassistant.core import HomeAssistant, Event
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
 from homeassistant.components.modbus.modbus import ModbusHub
 from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.reload import async_setup_reload_service
 from homeassistant.helpers.typing import ConfigType
 
-from .const import WAGO_DOMAIN as DOMAIN, CONF_HUB, SIGNAL_STOP_ENTITY, PLATFORMS
+from .const import (
+    WAGO_DOMAIN as DOMAIN,
+    CONF_HUB,
+    CONF_MAX_READ_GAP,
+    CONF_WRITE_WINDOW,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_IDLE_CYCLES,
+    CONF_CACHE_TTL,
+    CONF_QUEUE_DEPTH,
+    CONF_FAILURE_THRESHOLD,
+    CONF_MAX_BACKOFF,
+    CONF_MAX_IN_FLIGHT,
+    CONF_POOL_SIZE,
+    BREAKER_MIN_BACKOFF,
+    DATA_TYPE_F32,
+    DATA_TYPE_U8,
+    ORDER_LITTLE,
+    PRIORITY_COMMAND,
+    SIGNAL_STOP_ENTITY,
+    SERVICE_DIAGNOSTICS,
+    PLATFORMS,
+)
+from .breaker import CircuitBreaker
+from .cache import ReadCache
+from .codec import RegisterCodec, RegisterDecoder, flag_alias, flag_register
+from .request_queue import RequestQueue
+from .stats import HubStats
+from .coordinator import WagoCoordinator
+from .diagnostics import async_get_hub_diagnostics
+from .motion import MotionMonitor
+from .pool import ConnectionPool
+from .pulse import PulseEngine
+from .writer import WriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
+READ_CALL_TYPES = (
+    CALL_TYPE_COIL,
+    CALL_TYPE_DISCRETE,
+    CALL_TYPE_REGISTER_HOLDING,
+    CALL_TYPE_REGISTER_INPUT,
+)
+
+U8 = {shift: RegisterCodec(DATA_TYPE_U8, shift=shift) for shift in range(9)}
+# 32 coils form a little endian float, so the low word comes first
+F32 = RegisterCodec(DATA_TYPE_F32, word_order=ORDER_LITTLE)
+
 
 async def async_wago_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     # await async_setup_reload_service(hass, DOMAIN, [DOMAIN])
@@ -58,9 +112,9 @@ async def async_wago_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         if not await my_hub.async_setup():
             return False
 
-        # load platforms
+        # load platforms, sensor always for the diagnostic sensors of the hub
         for component, conf_key in PLATFORMS:
-            if conf_key in conf_hub:
+            if conf_key in conf_hub or component == Platform.SENSOR:
                 hass.async_create_task(
                     async_load_platform(hass, component, DOMAIN, conf_hub, config)
                 )
@@ -74,13 +128,56 @@ async def async_wago_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_stop_modbus)
 
+    async def async_diagnostics(call: ServiceCall) -> ServiceResponse:
+        """Return the diagnostics of every hub."""
+        return {
+            name: async_get_hub_diagnostics(hub) for name, hub in hub_collect.items()
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DIAGNOSTICS,
+        async_diagnostics,
+        supports_response=SupportsResponse.ONLY,
+    )
+
     return True
 
 
 class WagoHub:
     def __init__(self, hass: HomeAssistant, config: dict[str, Any]):
         self.name = config[CONF_NAME]
+        self._hass = hass
         self._modbus_hub: ModbusHub = hass.data[MODBUS_DOMAIN][config[CONF_HUB]]
+        self.coordinator = WagoCoordinator(
+            hass,
+            self,
+            config[CONF_MAX_READ_GAP],
+            config[CONF_FAST_SCAN_INTERVAL],
+            config[CONF_MAX_SCAN_INTERVAL],
+            config[CONF_IDLE_CYCLES],
+        )
+        self.pulse = PulseEngine(hass, self)
+        self.motion = MotionMonitor(hass, self, config[CONF_MAX_READ_GAP])
+        self.writer = WriteQueue(hass, self, config[CONF_WRITE_WINDOW].total_seconds())
+        self.cache = ReadCache(hass, config[CONF_CACHE_TTL].total_seconds())
+        self.queue = RequestQueue(hass, self.name, config[CONF_QUEUE_DEPTH])
+        self.stats = HubStats()
+        self.breaker = CircuitBreaker(
+            hass,
+            self.name,
+            config[CONF_FAILURE_THRESHOLD],
+            self._async_probe,
+            self.coordinator.async_suspend,
+            self.coordinator.async_resume,
+            BREAKER_MIN_BACKOFF,
+            config[CONF_MAX_BACKOFF].total_seconds(),
+        )
+        self._max_in_flight: int = config[CONF_MAX_IN_FLIGHT]
+        self._pool_size: int = config[CONF_POOL_SIZE]
+        self.pool: ConnectionPool | None = None
+        # cover entities by entity id, for the set_covers service
+        self.covers: dict[str, Any] = {}
 
     async def async_setup(self) -> bool:
         if self._modbus_hub._client is None:
@@ -97,11 +194,65 @@ class WagoHub:
             _LOGGER.error(f"MdobusHub is not connected {self._modbus_hub.name}")
             return False
 
+        if (self._max_in_flight > 1 or self._pool_size > 1) and self.pool is None:
+            await self._async_setup_pool()
+
         _LOGGER.info(f"WagoHub {self.name} is setup")
 
         return True
 
+    async def _async_setup_pool(self) -> None:
+        """Connect TCP sessions of our own that pipeline requests, if possible."""
+        client = self._modbus_hub._client
+        # rtuovertcp hubs are tcp clients too, but the pipeline speaks MBAP
+        if not isinstance(client, AsyncModbusTcpClient) or not isinstance(
+            client.framer, ModbusSocketFramer
+        ):
+            _LOGGER.warning(
+                f"WagoHub {self.name}: {CONF_MAX_IN_FLIGHT} and {CONF_POOL_SIZE} "
+                f"need a tcp Modbus Hub, ignored"
+            )
+            return
+
+        params = client.comm_params
+        pool = ConnectionPool(
+            self._hass,
+            self.name,
+            params.host,
+            params.port,
+            self._pool_size,
+            self._max_in_flight,
+            params.timeout_connect or 3,
+            self._probe_target,
+        )
+        if not await pool.async_connect():
+            _LOGGER.warning(
+                f"WagoHub {self.name}: connection pool failed to connect, "
+                f"using the Modbus Hub"
+            )
+            await pool.async_close()
+            return
+
+        self.pool = pool
+        self.queue.concurrency = pool.concurrency
+        _LOGGER.info(
+            f"WagoHub {self.name}: {self._pool_size} sessions with up to "
+            f"{self._max_in_flight} requests in flight each"
+        )
+
     async def async_close(self) -> None:
+        self.coordinator.async_stop()
+        await self.breaker.async_close()
+        await self.motion.async_close()
+        await self.pulse.async_close()
+        await self.writer.async_close()
+        await self.queue.async_close()
+
+        if self.pool is not None:
+            await self.pool.async_close()
+            self.pool = None
+            self.queue.concurrency = 1
+
         if self._modbus_hub._client is not None:
             _LOGGER.info(f"Close Modbus Hub connection {self._modbus_hub.name}")
             await self._modbus_hub.async_close()
@@ -110,23 +261,104 @@ class WagoHub:
 
     def _log_error(self, text: str):
         log_text = f"Pymodbus: {self.name}: {text}"
+        if self.breaker.is_open:
+            # reported once by the breaker
+            _LOGGER.debug(log_text)
+            return
         _LOGGER.error(log_text)
 
-    async def _read(self, addr: int, count=1) -> list[bool] | None:
+    def _probe_target(self) -> tuple[str, int]:
+        """Call type and address of a read to check the gateway with."""
+        if blocks := self.coordinator.plan.blocks:
+            return blocks[0].call_type, blocks[0].start
+        return CALL_TYPE_COIL, 0
+
+    async def _async_probe(self) -> bool:
+        """Check whether the gateway answers, with a read of the first block."""
+        if self.pool is not None:
+            return await self.pool.async_check()
+
+        if self._modbus_hub._client is None or self._modbus_hub._client.connected is False:
+            await self._modbus_hub.async_restart()
+
+        call_type, addr = self._probe_target()
+        result = await self._modbus_hub.async_pb_call(None, addr, 1, call_type)
+        return result is not None
+
+    async def _async_pb_call(
+        self, priority: int, addr: int, value: Any, call_type: str
+    ) -> Any:
+        """Queue a call to the Modbus hub by priority."""
+        if self.breaker.is_open:
+            return None
+
+        key = (call_type, addr, value) if call_type in READ_CALL_TYPES else None
+
+        async def call() -> Any:
+            if self.breaker.is_open:
+                # queued before the breaker opened
+                return None
+
+            start = time.monotonic()
+            result = None
+            try:
+                if self.pool is not None:
+                    result = await self.pool.async_call(addr, value, call_type)
+                else:
+                    result = await self._modbus_hub.async_pb_call(
+                        None, addr, value, call_type
+                    )
+                return result
+            finally:
+                ok = result is not None and not result.isError()
+                self.stats.record_call(call_type, value, time.monotonic() - start, ok)
+                # an exception response, e.g. an illegal address, still proves
+                # the gateway reachable, only lost calls count for the breaker
+                self.breaker.record(result is not None)
+
+        return await self.queue.async_submit(priority, key, call)
+
+    async def _read(
+        self,
+        addr: int,
+        count=1,
+        priority: int = PRIORITY_COMMAND,
+        call_type: str = CALL_TYPE_COIL,
+    ) -> list[bool] | None:
+        key = (call_type, addr, count)
+
+        return await self.cache.async_read(
+            key,
+            lambda: self._read_coils(addr, count, priority, call_type),
+            lambda: self.queue.promote(key, priority),
+        )
+
+    async def _read_coils(
+        self, addr: int, count: int, priority: int, call_type: str
+    ) -> list[bool] | None:
         if self._modbus_hub is None:
             error = "Tried to read with no Modbus Hub Connection!"
             self._log_error(error)
             return None
 
-        result = await self._modbus_hub.async_pb_call(None, addr, count, CALL_TYPE_COIL)
+        result = await self._async_pb_call(priority, addr, count, call_type)
 
         if result is None or result.isError():
-            error = f"Error: Read at address: {addr} count: {count} -> 'No Exception'"
+            error = f"Error: Read {call_type} at address: {addr} count: {count} -> 'No Exception'"
             self._log_error(error)
             return None
 
         return result.bits
 
+    async def async_read_bits(
+        self,
+        addr: int,
+        count=1,
+        priority: int = PRIORITY_COMMAND,
+        call_type: str = CALL_TYPE_COIL,
+    ) -> list[bool] | None:
+        return await self._read(addr, count, priority, call_type)
+
     async def async_read_bool(self, addr: int) -> bool | None:
         data = await self._read(addr, 1)
 
@@ -143,24 +375,81 @@ class WagoHub:
 
         return pack_bitstring(result)
     
-    async def async_read_register(self, addr: int) -> bytes | None:
+    async def async_read_registers(
+        self,
+        addr: int,
+        count=1,
+        priority: int = PRIORITY_COMMAND,
+        call_type: str = CALL_TYPE_REGISTER_HOLDING,
+    ) -> list[int] | None:
+        key = (call_type, addr, count)
+
+        return await self.cache.async_read(
+            key,
+            lambda: self._read_registers(addr, count, priority, call_type),
+            lambda: self.queue.promote(key, priority),
+        )
+
+    async def _read_registers(
+        self, addr: int, count: int, priority: int, call_type: str
+    ) -> list[int] | None:
         if self._modbus_hub is None:
             error = "Tried to read with no Modbus Hub Connection!"
             self._log_error(error)
             return None
 
-        result = await self._modbus_hub.async_pb_call(None, addr, 1, CALL_TYPE_REGISTER_HOLDING)
+        result = await self._async_pb_call(priority, addr, count, call_type)
 
         if result is None or result.isError():
-            error = f"Error: ReadHolding at address: {addr} -> 'No Exception'"
+            error = f"Error: Read {call_type} at address: {addr} count: {count} -> 'No Exception'"
             self._log_error(error)
             return None
-        
-        data = struct.pack('>H', result.registers[0])
+
+        return result.registers
+
+    async def async_read_register(self, addr: int) -> bytes | None:
+        registers = await self.async_read_registers(addr, 1)
+
+        if registers is None:
+            return None
+
+        data = struct.pack('>H', registers[0])
 
         return data
 
+    async def async_read_value(
+        self,
+        addr: int,
+        codec: RegisterCodec,
+        call_type: str = CALL_TYPE_REGISTER_HOLDING,
+        priority: int = PRIORITY_COMMAND,
+    ) -> int | float | None:
+        registers = await self.async_read_registers(addr, codec.count, priority, call_type)
+
+        if registers is None:
+            return None
+
+        return codec.decode(registers)
+
+    async def async_read_values(
+        self,
+        addr: int,
+        decoder: RegisterDecoder,
+        call_type: str = CALL_TYPE_REGISTER_HOLDING,
+        priority: int = PRIORITY_COMMAND,
+    ) -> list[int | float] | None:
+        """Read the block of a decoder in one request and decode all its values."""
+        registers = await self.async_read_registers(addr, decoder.count, priority, call_type)
+
+        if registers is None:
+            return None
+
+        return decoder.decode(registers)
+
     async def async_read_f32(self, addr: int) -> float | None:
+        if (register := flag_register(addr)) is not None and register[1] == 0:
+            return await self.async_read_value(register[0], F32)
+
         data = await self.async_read(addr, 32)
 
         if data is None:
@@ -169,6 +458,9 @@ class WagoHub:
         return struct.unpack("<f", data)[0]
 
     async def async_read_u8(self, addr: int) -> int | None:
+        if (register := flag_register(addr)) is not None:
+            return await self.async_read_value(register[0], U8[register[1]])
+
         data = await self.async_read(addr, 8)
 
         if data is None:
@@ -182,8 +474,8 @@ class WagoHub:
             self._log_error(error)
             return False
 
-        result = await self._modbus_hub.async_pb_call(
-            None, addr, value, CALL_TYPE_WRITE_COILS
+        result = await self._async_pb_call(
+            PRIORITY_COMMAND, addr, value, CALL_TYPE_WRITE_COILS
         )
 
         if result is None or result.isError():
@@ -193,52 +485,84 @@ class WagoHub:
 
         return True
 
-    async def async_write_bool(self, addr: int, value: bool) -> bool:
-        _LOGGER.debug(f"Write: addr: {addr} value: {value}")
-
+    async def _write_registers(self, addr: int, value: list[int]) -> bool:
         if self._modbus_hub is None:
             error = "Tried to write with no Modbus Hub Connection!"
             self._log_error(error)
             return False
 
-        result = await self._modbus_hub.async_pb_call(
-            None, addr, int(value), CALL_TYPE_WRITE_COIL
+        result = await self._async_pb_call(
+            PRIORITY_COMMAND, addr, value, CALL_TYPE_WRITE_REGISTERS
         )
 
         if result is None or result.isError():
-            error = f"Error: Write at address: {addr} value: {value} -> 'No Exception'"
+            error = f"Error: WriteRegisters at address: {addr} value: {value} -> 'No Exception'"
             self._log_error(error)
             return False
 
         return True
 
+    async def async_write_frame(self, call_type: str, addr: int, value: list) -> bool:
+        """Send one merged frame of the write queue."""
+        read_type = CALL_TYPE_COIL if call_type == CALL_TYPE_WRITE_COILS else CALL_TYPE_REGISTER_HOLDING
+
+        self.invalidate(read_type, addr, len(value))
+        try:
+            if call_type == CALL_TYPE_WRITE_COILS:
+                return await self._write(addr, value)
+
+            return await self._write_registers(addr, value)
+        finally:
+            self.invalidate(read_type, addr, len(value))
+
+    def invalidate(self, call_type: str, addr: int, count: int) -> None:
+        """Drop cached reads of a range, and of its flag area alias.
+
+        Called for written ranges and for ranges the PLC changes in response
+        to a command, like the ison coil of a pulsed light.
+        """
+        self.cache.invalidate(call_type, addr, count)
+        if (alias := flag_alias(call_type, addr, count)) is not None:
+            self.cache.invalidate(*alias)
+
+    async def async_write_coils(self, addr: int, values: list[bool]) -> bool:
+        return await self.writer.async_write(CALL_TYPE_WRITE_COILS, addr, values)
+
+    async def async_write_registers(self, addr: int, values: list[int]) -> bool:
+        return await self.writer.async_write(CALL_TYPE_WRITE_REGISTERS, addr, values)
+
+    async def async_pulse(self, addr: int, width: timedelta) -> bool:
+        """Write a set/reset pulse, batched with the pulses of other entities."""
+        _LOGGER.debug(f"Pulse: addr: {addr} width: {width}")
+
+        return await self.pulse.async_pulse(addr, width.total_seconds())
+
+    async def async_write_bool(self, addr: int, value: bool) -> bool:
+        _LOGGER.debug(f"Write: addr: {addr} value: {value}")
+
+        return await self.async_write_coils(addr, [value])
+
     async def async_write(self, addr: int, value: bytes) -> bool:
         _LOGGER.debug(f"Write: addr: {addr} value: {value}")
 
         data = unpack_bitstring(value)
 
-        return await self._write(addr, data)
-    
-    async def async_write_register(self, addr: int, value: bytes) -> bool:
-        if self._modbus_hub is None:
-            error = "Tried to write with no Modbus Hub Connection!"
-            self._log_error(error)
-            return False
+        return await self.async_write_coils(addr, data)
 
+    async def async_write_register(self, addr: int, value: bytes) -> bool:
         data, = struct.unpack('>H', value)
 
-        result = await self._modbus_hub.async_pb_call(
-            None, addr, data, CALL_TYPE_WRITE_REGISTER
-        )
+        return await self.async_write_registers(addr, [data])
 
-        if result is None or result.isError():
-            error = f"Error: Write at address: {addr} value: {value} -> 'No Exception'"
-            self._log_error(error)
-            return False
-
-        return True
+    async def async_write_value(
+        self, addr: int, codec: RegisterCodec, value: int | float
+    ) -> bool:
+        return await self.async_write_registers(addr, codec.encode(value))
 
     async def async_write_f32(self, addr: int, value: float) -> bool:
+        if (register := flag_register(addr)) is not None and register[1] == 0:
+            return await self.async_write_value(register[0], F32, value)
+
         data = struct.pack("<f", value)
 
         return await self.async_write(addr, data)
@@ -0,0 +1,155 @@
+# Wago write coalescing
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.components.modbus.const import CALL_TYPE_WRITE_COILS
+from homeassistant.core import HomeAssistant, callback
+
+from .const import MAX_WRITE_COILS, MAX_WRITE_REGISTERS
+from .plan import merge_ranges
+
+if TYPE_CHECKING:
+    from .wago import WagoHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedWrite:
+    call_type: str
+    addr: int
+    values: list[bool] | list[int]
+    future: asyncio.Future[bool]
+    frames: int = 0
+    failed: bool = False
+
+
+@dataclass
+class WriteFrame:
+    call_type: str
+    start: int
+    values: list = field(default_factory=list)
+    writes: list[QueuedWrite] = field(default_factory=list)
+
+
+def build_write_frames(writes: Sequence[QueuedWrite]) -> list[list[WriteFrame]]:
+    """Merge queued writes into frames.
+
+    Writes to the same address keep their order: a later write to an address
+    goes into a later generation. Within a generation, writes to adjacent
+    addresses share one frame. Frames are ordered by their earliest write.
+    """
+    generations: list[list[QueuedWrite]] = []
+    last: dict[tuple[str, int], int] = {}
+
+    for write in writes:
+        keys = [(write.call_type, a) for a in range(write.addr, write.addr + len(write.values))]
+        generation = max((last[key] + 1 for key in keys if key in last), default=0)
+        for key in keys:
+            last[key] = generation
+        while len(generations) <= generation:
+            generations.append([])
+        generations[generation].append(write)
+
+    result: list[list[WriteFrame]] = []
+    for generation in generations:
+        frames: list[tuple[int, WriteFrame]] = []
+        for call_type in dict.fromkeys(write.call_type for write in generation):
+            values: dict[int, tuple[bool | int, int, QueuedWrite]] = {}
+            for index, write in enumerate(generation):
+                if write.call_type != call_type:
+                    continue
+                for offset, value in enumerate(write.values):
+                    values[write.addr + offset] = (value, index, write)
+
+            max_count = MAX_WRITE_COILS if call_type == CALL_TYPE_WRITE_COILS else MAX_WRITE_REGISTERS
+            for start, count in merge_ranges(values, 0, max_count):
+                frame = WriteFrame(call_type, start)
+                first = len(generation)
+                for addr in range(start, start + count):
+                    value, index, write = values[addr]
+                    frame.values.append(value)
+                    if write not in frame.writes:
+                        frame.writes.append(write)
+                        write.frames += 1
+                    first = min(first, index)
+                frames.append((first, frame))
+
+        frames.sort(key=lambda item: item[0])
+        result.append([frame for _, frame in frames])
+
+    return result
+
+
+class WriteQueue:
+    """Coalesce the writes of a hub queued within a short window."""
+
+    def __init__(self, hass: HomeAssistant, hub: WagoHub, window: float) -> None:
+        self._hass = hass
+        self._hub = hub
+        self._window = window
+        self._queue: list[QueuedWrite] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_write(
+        self, call_type: str, addr: int, values: list[bool] | list[int]
+    ) -> bool:
+        future: asyncio.Future[bool] = self._hass.loop.create_future()
+        self._queue.append(QueuedWrite(call_type, addr, list(values), future))
+
+        if self._handle is None:
+            self._handle = self._hass.loop.call_later(self._window, self._flush)
+
+        return await future
+
+    @callback
+    def _flush(self) -> None:
+        self._handle = None
+        writes, self._queue = self._queue, []
+        self._hass.async_create_task(self._async_flush(writes))
+
+    async def _async_flush(self, writes: list[QueuedWrite]) -> None:
+        # keep the order of consecutive flushes
+        async with self._lock:
+            generations = build_write_frames(writes)
+            _LOGGER.debug(
+                f"WagoHub {self._hub.name}: {len(writes)} writes in {sum(len(g) for g in generations)} frames"
+            )
+
+            try:
+                for frames in generations:
+                    for frame in frames:
+                        try:
+                            ok = await self._hub.async_write_frame(
+                                frame.call_type, frame.start, frame.values
+                            )
+                        except Exception as err:  # pylint: disable=broad-except
+                            _LOGGER.error(
+                                f"WagoHub {self._hub.name}: write at {frame.start} failed: {err}"
+                            )
+                            ok = False
+                        for write in frame.writes:
+                            write.failed |= not ok
+                            write.frames -= 1
+                            if write.frames == 0 and not write.future.done():
+                                write.future.set_result(not write.failed)
+            finally:
+                # e.g. cancelled, never leave a caller waiting
+                for write in writes:
+                    if not write.future.done():
+                        write.future.set_result(False)
+
+    async def async_close(self) -> None:
+        """Write everything that is still queued."""
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        writes, self._queue = self._queue, []
+        if writes:
+            await self._async_flush(writes)
@@ -0,0 +1,422 @@
+# Wago PLC simulator
+"""Modbus TCP stand-in for the WAGO controller.
+
+Models the light and cover logic the integration expects, so frames per poll
+cycle and command latency can be measured without the real controller:
+
+    python tools/wago_simulator.py --config configuration.yaml --port 5020
+
+Point the modbus hub of a test instance at the simulator, or use
+WagoSimulator directly from a benchmark.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+import logging
+import random
+import struct
+from typing import Any
+
+import yaml
+
+_LOGGER = logging.getLogger(__name__)
+
+# WAGO maps the coils from 0x3000 on onto the bits of the registers from
+# 0x3000 on (%MX<n>.<b> is bit b of %MW<n>)
+FLAG_AREA = 0x3000
+
+READ_COILS = 1
+READ_DISCRETE_INPUTS = 2
+READ_HOLDING_REGISTERS = 3
+READ_INPUT_REGISTERS = 4
+WRITE_COIL = 5
+WRITE_REGISTER = 6
+WRITE_COILS = 15
+WRITE_REGISTERS = 16
+
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_ADDRESS = 2
+ILLEGAL_DATA_VALUE = 3
+DEVICE_FAILURE = 4
+
+MAX_READ_COILS = 2000
+MAX_READ_REGISTERS = 125
+
+
+class ModbusError(Exception):
+    def __init__(self, code: int) -> None:
+        super().__init__(code)
+        self.code = code
+
+
+@dataclass
+class Faults:
+    """Injected latency in seconds, uniform jitter and error probability."""
+
+    latency: float = 0
+    jitter: float = 0
+    error_rate: float = 0
+
+    def delay(self) -> float:
+        return max(0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+
+@dataclass
+class Light:
+    address_set: int
+    address_rst: int
+    address_ison: int
+    address_valset: int | None = None
+    address_brightness: int | None = None
+
+
+@dataclass
+class Cover:
+    address_set: int
+    address_reg_pa: int
+    address_reg_posang: int
+    target: tuple[int, int] | None = None
+    ang: float = 0
+    pos: float = 0
+
+
+@dataclass
+class Stats:
+    frames: Counter = field(default_factory=Counter)
+    errors: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    @property
+    def total(self) -> int:
+        return sum(self.frames.values())
+
+
+class ProcessImage:
+    """Coils and registers of the controller, with the WAGO flag aliasing."""
+
+    def __init__(self) -> None:
+        self.coils: dict[int, bool] = {}
+        self.discrete_inputs: dict[int, bool] = {}
+        self.registers: dict[int, int] = {}
+        self.input_registers: dict[int, int] = {}
+
+    def get_coil(self, addr: int) -> bool:
+        if addr >= FLAG_AREA:
+            word, bit = divmod(addr - FLAG_AREA, 16)
+            return bool(self.registers.get(FLAG_AREA + word, 0) >> bit & 1)
+        return self.coils.get(addr, False)
+
+    def set_coil(self, addr: int, value: bool) -> None:
+        if addr >= FLAG_AREA:
+            word, bit = divmod(addr - FLAG_AREA, 16)
+            reg = self.registers.get(FLAG_AREA + word, 0)
+            reg = reg | 1 << bit if value else reg & ~(1 << bit)
+            self.registers[FLAG_AREA + word] = reg
+        else:
+            self.coils[addr] = value
+
+    def get_u8(self, addr: int) -> int:
+        return sum(self.get_coil(addr + i) << i for i in range(8))
+
+    def set_u8(self, addr: int, value: int) -> None:
+        for i in range(8):
+            self.set_coil(addr + i, bool(value >> i & 1))
+
+
+class WagoSimulator:
+    """Simulated controller running the light and cover logic."""
+
+    def __init__(
+        self,
+        lights: list[Light] | None = None,
+        covers: list[Cover] | None = None,
+        travel_time: float = 30,
+        faults: Faults | None = None,
+        tick: float = 0.05,
+    ) -> None:
+        self.image = ProcessImage()
+        self.lights = lights or []
+        self.covers = covers or []
+        self.travel_time = travel_time
+        self.faults = faults or Faults()
+        self.stats = Stats()
+        self._tick = tick
+        self._edges: dict[int, bool] = {}
+        self._server: asyncio.AbstractServer | None = None
+        self._connections: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any], **kwargs: Any) -> WagoSimulator:
+        """Build the simulator from the wago section of configuration.yaml."""
+        lights = []
+        covers = []
+        for hub in config.get("wago") or []:
+            for light in hub.get("lights") or []:
+                lights.append(
+                    Light(
+                        light["address_set"],
+                        light["address_rst"],
+                        light["address_ison"],
+                        light.get("address_valset"),
+                        light.get("address_brightness"),
+                    )
+                )
+            for cover in hub.get("covers") or []:
+                covers.append(
+                    Cover(
+                        cover["address_set"],
+                        cover["address_reg_pa"],
+                        cover["address_reg_posang"],
+                    )
+                )
+        return cls(lights, covers, **kwargs)
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 5020) -> int:
+        """Start serving, return the bound port."""
+        self._server = await asyncio.start_server(self._async_handle, host, port)
+        self._task = asyncio.create_task(self._async_run())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._server is not None:
+            self._server.close()
+            for task in self._connections:
+                task.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    def _rising(self, addr: int) -> bool:
+        value = self.image.get_coil(addr)
+        last = self._edges.get(addr, False)
+        self._edges[addr] = value
+        return value and not last
+
+    def step(self, dt: float) -> None:
+        """Advance the PLC program by dt seconds."""
+        image = self.image
+
+        for light in self.lights:
+            if self._rising(light.address_set):
+                image.set_coil(light.address_ison, True)
+                if light.address_valset is not None and light.address_brightness is not None:
+                    image.set_u8(light.address_brightness, image.get_u8(light.address_valset))
+            if self._rising(light.address_rst):
+                image.set_coil(light.address_ison, False)
+
+        step = 255 * dt / self.travel_time if self.travel_time > 0 else 255
+        for cover in self.covers:
+            if self._rising(cover.address_set):
+                pa = image.registers.get(cover.address_reg_pa, 0)
+                cover.target = (pa >> 8, pa & 0xFF)
+            if cover.target is None:
+                continue
+
+            cover.ang = _approach(cover.ang, cover.target[0], step)
+            cover.pos = _approach(cover.pos, cover.target[1], step)
+            image.registers[cover.address_reg_posang] = round(cover.ang) << 8 | round(cover.pos)
+            if (cover.ang, cover.pos) == cover.target:
+                cover.target = None
+
+    async def _async_run(self) -> None:
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(self._tick)
+            now = loop.time()
+            self.step(now - last)
+            last = now
+
+    async def _async_handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        lock = asyncio.Lock()
+        tasks: set[asyncio.Task] = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                tid, pid, length, uid = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                self.stats.bytes_in += 7 + len(pdu)
+
+                # answer requests concurrently, like a coupler accepting
+                # several outstanding transactions
+                task = asyncio.create_task(
+                    self._async_respond(writer, lock, tid, pid, uid, pdu)
+                )
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _async_respond(
+        self,
+        writer: asyncio.StreamWriter,
+        lock: asyncio.Lock,
+        tid: int,
+        pid: int,
+        uid: int,
+        pdu: bytes,
+    ) -> None:
+        if delay := self.faults.delay():
+            await asyncio.sleep(delay)
+
+        function = pdu[0]
+        self.stats.frames[function] += 1
+        try:
+            if random.random() < self.faults.error_rate:
+                raise ModbusError(DEVICE_FAILURE)
+            response = bytes([function]) + self.execute(function, pdu[1:])
+        except ModbusError as err:
+            self.stats.errors += 1
+            response = bytes([function | 0x80, err.code])
+
+        frame = struct.pack(">HHHB", tid, pid, len(response) + 1, uid) + response
+        self.stats.bytes_out += len(frame)
+        async with lock:
+            writer.write(frame)
+            await writer.drain()
+
+    def execute(self, function: int, data: bytes) -> bytes:
+        """Run one request PDU without the function code, return the response data."""
+        image = self.image
+
+        if function in (READ_COILS, READ_DISCRETE_INPUTS):
+            addr, count = _unpack(">HH", data)
+            if not 1 <= count <= MAX_READ_COILS:
+                raise ModbusError(ILLEGAL_DATA_VALUE)
+            if function == READ_COILS:
+                bits = [image.get_coil(addr + i) for i in range(count)]
+            else:
+                bits = [image.discrete_inputs.get(addr + i, False) for i in range(count)]
+            packed = _pack_bits(bits)
+            return bytes([len(packed)]) + packed
+
+        if function in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+            addr, count = _unpack(">HH", data)
+            if not 1 <= count <= MAX_READ_REGISTERS:
+                raise ModbusError(ILLEGAL_DATA_VALUE)
+            source = image.registers if function == READ_HOLDING_REGISTERS else image.input_registers
+            values = [source.get(addr + i, 0) for i in range(count)]
+            return bytes([2 * count]) + struct.pack(f">{count}H", *values)
+
+        if function == WRITE_COIL:
+            addr, value = _unpack(">HH", data)
+            if value not in (0x0000, 0xFF00):
+                raise ModbusError(ILLEGAL_DATA_VALUE)
+            image.set_coil(addr, value == 0xFF00)
+            return data[:4]
+
+        if function == WRITE_REGISTER:
+            addr, value = _unpack(">HH", data)
+            image.registers[addr] = value
+            return data[:4]
+
+        if function == WRITE_COILS:
+            addr, count, size = _unpack(">HHB", data)
+            if len(data) < 5 + size or size != (count + 7) // 8:
+                raise ModbusError(ILLEGAL_DATA_VALUE)
+            packed = data[5 : 5 + size]
+            for i in range(count):
+                image.set_coil(addr + i, bool(packed[i // 8] >> (i % 8) & 1))
+            return data[:4]
+
+        if function == WRITE_REGISTERS:
+            addr, count, size = _unpack(">HHB", data)
+            if len(data) < 5 + size or size != 2 * count:
+                raise ModbusError(ILLEGAL_DATA_VALUE)
+            for i, value in enumerate(struct.unpack(f">{count}H", data[5 : 5 + size])):
+                image.registers[addr + i] = value
+            return data[:4]
+
+        raise ModbusError(ILLEGAL_FUNCTION)
+
+
+def _unpack(fmt: str, data: bytes) -> tuple:
+    try:
+        return struct.unpack_from(fmt, data)
+    except struct.error as err:
+        raise ModbusError(ILLEGAL_DATA_VALUE) from err
+
+
+def _pack_bits(bits: list[bool]) -> bytes:
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            packed[i // 8] |= 1 << (i % 8)
+    return bytes(packed)
+
+
+def _approach(value: float, target: int, step: float) -> float:
+    if abs(target - value) <= step:
+        return target
+    return value + step if target > value else value - step
+
+
+class _ConfigLoader(yaml.SafeLoader):
+    """Safe loader ignoring Home Assistant tags like !secret."""
+
+
+_ConfigLoader.add_multi_constructor("!", lambda loader, suffix, node: None)
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    with open(args.config, encoding="utf-8") as file:
+        config = yaml.load(file, Loader=_ConfigLoader) or {}
+
+    simulator = WagoSimulator.from_config(
+        config,
+        travel_time=args.travel_time,
+        faults=Faults(args.latency, args.jitter, args.error_rate),
+    )
+    port = await simulator.async_start(args.host, args.port)
+    _LOGGER.info(
+        f"Simulating {len(simulator.lights)} lights and {len(simulator.covers)} covers on {args.host}:{port}"
+    )
+
+    total = 0
+    while True:
+        await asyncio.sleep(args.report)
+        stats = simulator.stats
+        _LOGGER.info(
+            f"{stats.total - total} frames in {args.report}s, {stats.errors} errors, by function: {dict(stats.frames)}"
+        )
+        total = stats.total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="configuration.yaml")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5020)
+    parser.add_argument("--travel-time", type=float, default=30, help="seconds for a full cover travel")
+    parser.add_argument("--latency", type=float, default=0, help="response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="uniform latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="probability of a device failure response")
+    parser.add_argument("--report", type=float, default=10, help="seconds between frame reports")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()